@@ -4,36 +4,68 @@ Replay ID persistence for CDC event resumption.
 Stores last processed replay ID per channel to enable crash recovery.
 """
 
+import atexit
 import json
 import logging
 import threading
+import time
+import weakref
 from pathlib import Path
 from typing import Optional, Dict
 
 
 logger = logging.getLogger(__name__)
 
+# Live stores, flushed by one exit hook; weak so the hook keeps none alive
+_STORES: "weakref.WeakSet[ReplayStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all():
+    """Write back buffered replay IDs of every live store at interpreter exit."""
+    for store in list(_STORES):
+        store.flush()
+
 
 class ReplayStore:
-    """Thread-safe replay ID storage."""
+    """
+    Thread-safe replay ID storage.
 
-    def __init__(self, path: str = '.replay.json'):
+    Replay IDs are held in memory and written to disk at most once per
+    flush_interval (plus on flush() and at interpreter exit), so a burst of
+    events costs one file write rather than one per event. A background
+    timer writes the tail of a burst, so a crash loses at most the last
+    flush_interval of IDs; those events are replayed again on restart.
+    """
+
+    def __init__(self, path: str = '.replay.json', flush_interval: Optional[float] = 1.0):
         """
         Initialize replay store.
 
         Args:
             path: Path to replay state file
+            flush_interval: Longest a set() replay ID stays unwritten, in
+                seconds; if None, only flush() writes
         """
         self.path = Path(path)
+        self.flush_interval = flush_interval
         self._lock = threading.Lock()
+        self._dirty: Dict[str, str] = {}
+        self._last_flush = time.monotonic()
+        self._timer: Optional[threading.Timer] = None
 
         # Initialize file if it doesn't exist
         if not self.path.exists():
+            self._data: Dict[str, str] = {}
             self._write({})
             logger.info("Replay store initialized", extra={'path': str(self.path)})
         else:
+            self._data = self._read()
             logger.info("Replay store loaded", extra={'path': str(self.path)})
 
+        # Don't lose buffered replay IDs on a clean shutdown
+        _STORES.add(self)
+
     def get(self, channel: str) -> Optional[str]:
         """
         Get last replay ID for a channel.
@@ -44,8 +76,8 @@ class ReplayStore:
         Returns:
             Replay ID or None if not found
         """
-        data = self._read()
-        replay_id = data.get(channel)
+        with self._lock:
+            replay_id = self._data.get(channel)
 
         logger.debug(
             "Replay ID retrieved",
@@ -58,14 +90,25 @@ class ReplayStore:
         """
         Store replay ID for a channel.
 
+        The ID is visible to get() immediately and reaches disk within
+        flush_interval, or on flush().
+
         Args:
             channel: CDC channel name
             replay_id: Replay ID to store
         """
         with self._lock:
-            data = self._read()
-            data[channel] = replay_id
-            self._write(data)
+            self._data[channel] = replay_id
+            self._dirty[channel] = replay_id
+            if self.flush_interval is not None:
+                elapsed = time.monotonic() - self._last_flush
+                if elapsed >= self.flush_interval:
+                    self._flush_locked()
+                elif self._timer is None:
+                    # Trailing write, so the last IDs of a burst don't wait for the next event
+                    self._timer = threading.Timer(self.flush_interval - elapsed, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
 
         logger.debug(
             "Replay ID stored",
@@ -79,7 +122,24 @@ class ReplayStore:
         Returns:
             Dictionary of channel -> replay_id
         """
-        return self._read()
+        with self._lock:
+            return dict(self._data)
+
+    def flush(self):
+        """Write replay IDs set since the last flush to disk."""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        """Write pending replay IDs; caller holds the lock."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._dirty:
+            self._write(self._data)
+            logger.debug("Replay store flushed", extra={'channels': len(self._dirty)})
+            self._dirty.clear()
+        self._last_flush = time.monotonic()
 
     def clear(self, channel: Optional[str] = None):
         """
@@ -90,12 +150,14 @@ class ReplayStore:
         """
         with self._lock:
             if channel:
-                data = self._read()
-                if channel in data:
-                    del data[channel]
-                    self._write(data)
+                if channel in self._data:
+                    del self._data[channel]
+                    self._write(self._data)
+                    self._dirty.clear()
                     logger.info("Replay ID cleared", extra={'channel': channel})
             else:
+                self._data.clear()
+                self._dirty.clear()
                 self._write({})
                 logger.info("All replay IDs cleared")
 
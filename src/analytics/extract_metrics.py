@@ -4,18 +4,53 @@ Metrics extraction and dashboard generation.
 Analyzes flywheel logs and Salesforce data to generate KPI reports.
 """
 
+import csv
 import json
 import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from math import fsum, isnan
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+import numpy as np
 import pandas as pd
 import structlog
+
+try:
+    import polars as pl
+except ImportError:  # Optional: faster aggregation engine
+    pl = None
 from src.salesforce.api_client import SalesforceAPIClient
 from src.flywheel.logger import FlywheelLogger
 
 logger = structlog.get_logger()
 
+_LATENCY_SOQL = (
+    "SELECT Id, CreatedDate, SystemModstamp FROM Lead "
+    "WHERE CreatedDate = LAST_N_DAYS:{days} AND OwnerId != NULL"
+)
+
+_TTFR_COLUMNS = ['Id', 'CreatedDate', 'First_Response_At__c', 'Time_to_First_Response__c', 'OwnerId']
+
+_TEMPLATE_CSV_COLUMNS = ['timestamp', 'lead_id', 'template_id', 'intent', 'confidence', 'reason']
+
+_TTFR_SOQL = (
+    f"SELECT {', '.join(_TTFR_COLUMNS)} FROM Lead "
+    "WHERE CreatedDate = LAST_N_DAYS:{days} AND First_Response_At__c != NULL"
+)
+
+
+def _marginal_counts(pair_counts: pd.Series, level: int) -> Dict[str, int]:
+    """
+    Collapse a two-key groupby size table to counts for one key.
+
+    Matches value_counts(): missing keys are dropped and counts are ordered
+    descending.
+    """
+    counts = pair_counts.groupby(level=level, sort=False).sum().sort_values(ascending=False)
+    return {key: int(count) for key, count in counts.items()}
+
 
 class MetricsExtractor:
     """Extracts and analyzes metrics for routing, TTFR, and templates."""
@@ -39,7 +74,12 @@ class MetricsExtractor:
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
-    def extract_routing_metrics(self, days: int = 30) -> Dict[str, Any]:
+    def extract_routing_metrics(
+        self,
+        days: int = 30,
+        routing_logs: Optional[List[Dict[str, Any]]] = None,
+        latency_leads: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Extract lead routing metrics.
 
@@ -50,6 +90,8 @@ class MetricsExtractor:
 
         Args:
             days: Number of days to analyze
+            routing_logs: Prefetched lead.route flywheel logs (read from disk if None)
+            latency_leads: Prefetched assignment latency records (queried if None)
 
         Returns:
             Routing metrics dictionary
@@ -57,41 +99,57 @@ class MetricsExtractor:
         logger.info("extracting_routing_metrics", days=days)
 
         # Get flywheel logs for routing
-        routing_logs = self.flywheel_logger.get_logs("lead.route", days=days)
+        if routing_logs is None:
+            routing_logs = self.flywheel_logger.get_logs("lead.route", days=days)
 
         if not routing_logs:
             logger.warning("no_routing_logs_found")
             return {"error": "No routing logs found"}
 
-        # Convert to DataFrame
-        df_logs = pd.DataFrame(routing_logs)
-
-        # Extract decision data
-        decisions = []
-        for _, row in df_logs.iterrows():
-            response = row.get('response', {})
-            metadata = row.get('metadata', {})
-
-            if response and 'choices' in response:
-                content = response['choices'][0]['message']['content']
-                decision = json.loads(content)
-
-                decisions.append({
-                    'timestamp': row.get('timestamp'),
-                    'lead_id': metadata.get('lead_id'),
-                    'segment': decision.get('segment'),
-                    'region': decision.get('region'),
-                    'confidence': decision.get('confidence', 0),
-                    'reason': decision.get('reason', '')
-                })
-
-        df_decisions = pd.DataFrame(decisions)
+        # Extract decision data straight into preallocated columns
+        n = len(routing_logs)
+        timestamps = np.empty(n, dtype=object)
+        lead_ids = np.empty(n, dtype=object)
+        segments = np.empty(n, dtype=object)
+        regions = np.empty(n, dtype=object)
+        confidences = np.empty(n, dtype=np.float32)
+        reasons = np.empty(n, dtype=object)
+
+        i = 0
+        for log in routing_logs:
+            response = log.get('response') or {}
+            if 'choices' not in response:
+                continue
+
+            metadata = log.get('metadata') or {}
+            decision = json.loads(response['choices'][0]['message']['content'])
+            confidence = decision.get('confidence', 0)
+
+            timestamps[i] = log.get('timestamp')
+            lead_ids[i] = metadata.get('lead_id')
+            segments[i] = decision.get('segment')
+            regions[i] = decision.get('region')
+            confidences[i] = np.nan if confidence is None else confidence
+            reasons[i] = decision.get('reason', '')
+            i += 1
+
+        df_decisions = pd.DataFrame({
+            'timestamp': timestamps[:i],
+            'lead_id': lead_ids[:i],
+            'segment': segments[:i],
+            'region': regions[:i],
+            'confidence': confidences[:i],
+            'reason': reasons[:i]
+        })
+
+        # Joint frequency table, marginalized per key (one hashing pass)
+        pair_counts = df_decisions.groupby(['segment', 'region'], sort=False, dropna=False).size()
 
         # Calculate metrics
         metrics = {
             "total_routed": len(df_decisions),
-            "by_segment": df_decisions['segment'].value_counts().to_dict(),
-            "by_region": df_decisions['region'].value_counts().to_dict(),
+            "by_segment": _marginal_counts(pair_counts, 0),
+            "by_region": _marginal_counts(pair_counts, 1),
             "avg_confidence": float(df_decisions['confidence'].mean()),
             "confidence_distribution": {
                 "high (>0.8)": int((df_decisions['confidence'] > 0.8).sum()),
@@ -101,7 +159,7 @@ class MetricsExtractor:
         }
 
         # Get assignment latency from Salesforce
-        latency_data = self._get_assignment_latency(days)
+        latency_data = self._get_assignment_latency(days, latency_leads)
         metrics['assignment_latency'] = latency_data
 
         # Save to CSV
@@ -111,16 +169,14 @@ class MetricsExtractor:
 
         return metrics
 
-    def _get_assignment_latency(self, days: int) -> Dict[str, float]:
-        """Get assignment latency from Salesforce."""
-        soql = f"""
-            SELECT Id, CreatedDate, SystemModstamp
-            FROM Lead
-            WHERE CreatedDate = LAST_N_DAYS:{days}
-            AND OwnerId != NULL
-        """
-
-        leads = self.sf_client.query(soql)
+    def _get_assignment_latency(
+        self,
+        days: int,
+        leads: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, float]:
+        """Get assignment latency from Salesforce (or prefetched lead records)."""
+        if leads is None:
+            leads = self.sf_client.query(_LATENCY_SOQL.format(days=days))
 
         latencies = []
         for lead in leads:
@@ -141,7 +197,11 @@ class MetricsExtractor:
             "avg_seconds": float(latencies_series.mean())
         }
 
-    def extract_ttfr_metrics(self, days: int = 30) -> Dict[str, Any]:
+    def extract_ttfr_metrics(
+        self,
+        days: int = 30,
+        leads: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Extract time-to-first-response (TTFR) metrics.
 
@@ -152,6 +212,7 @@ class MetricsExtractor:
 
         Args:
             days: Number of days to analyze
+            leads: Prefetched lead records (queried if None)
 
         Returns:
             TTFR metrics dictionary
@@ -159,58 +220,120 @@ class MetricsExtractor:
         logger.info("extracting_ttfr_metrics", days=days)
 
         # Query leads with first response data
-        soql = f"""
-            SELECT Id, CreatedDate, First_Response_At__c,
-                   Time_to_First_Response__c, First_Response_User__c,
-                   OwnerId, Owner.Name
-            FROM Lead
-            WHERE CreatedDate = LAST_N_DAYS:{days}
-            AND First_Response_At__c != NULL
-        """
-
-        leads = self.sf_client.query(soql)
+        if leads is None:
+            leads = self.sf_client.query(_TTFR_SOQL.format(days=days))
 
         if not leads:
             logger.warning("no_ttfr_data_found")
             return {"error": "No TTFR data found"}
 
-        # Convert to DataFrame
-        df = pd.DataFrame(leads)
-        df['ttfr_minutes'] = df['Time_to_First_Response__c'].astype(float)
-
         # SLA threshold (60 minutes)
         sla_threshold = 60
 
+        csv_path = self.output_dir / f"ttfr_metrics_{datetime.utcnow().strftime('%Y%m%d')}.csv"
+
+        # Aggregate (and save CSV) with Polars when available, pandas otherwise
+        if pl is not None:
+            stats = self._ttfr_stats_polars(leads, sla_threshold, csv_path)
+        else:
+            stats = self._ttfr_stats_pandas(leads, sla_threshold, csv_path)
+        logger.info("ttfr_metrics_saved", path=str(csv_path))
+
         metrics = {
-            "total_responses": len(df),
+            "total_responses": stats["count"],
             "ttfr_stats": {
-                "median_minutes": float(df['ttfr_minutes'].median()),
-                "p95_minutes": float(df['ttfr_minutes'].quantile(0.95)),
-                "max_minutes": float(df['ttfr_minutes'].max()),
-                "avg_minutes": float(df['ttfr_minutes'].mean())
+                "median_minutes": float(stats["median"]),
+                "p95_minutes": float(stats["p95"]),
+                "max_minutes": float(stats["max"]),
+                "avg_minutes": float(stats["mean"])
             },
             "sla_performance": {
                 "threshold_minutes": sla_threshold,
-                "within_sla": int((df['ttfr_minutes'] <= sla_threshold).sum()),
-                "breach_sla": int((df['ttfr_minutes'] > sla_threshold).sum()),
-                "breach_rate": float((df['ttfr_minutes'] > sla_threshold).sum() / len(df))
+                "within_sla": int(stats["within_sla"]),
+                "breach_sla": int(stats["breach_sla"]),
+                "breach_rate": float(stats["breach_sla"] / stats["count"])
             },
             "distribution": {
-                "0-15min": int((df['ttfr_minutes'] <= 15).sum()),
-                "15-30min": int(((df['ttfr_minutes'] > 15) & (df['ttfr_minutes'] <= 30)).sum()),
-                "30-60min": int(((df['ttfr_minutes'] > 30) & (df['ttfr_minutes'] <= 60)).sum()),
-                "60min+": int((df['ttfr_minutes'] > 60).sum())
+                "0-15min": int(stats["0-15min"]),
+                "15-30min": int(stats["15-30min"]),
+                "30-60min": int(stats["30-60min"]),
+                "60min+": int(stats["60min+"])
             }
         }
 
-        # Save to CSV
-        csv_path = self.output_dir / f"ttfr_metrics_{datetime.utcnow().strftime('%Y%m%d')}.csv"
-        df[['Id', 'CreatedDate', 'First_Response_At__c', 'ttfr_minutes', 'Owner']].to_csv(csv_path, index=False)
-        logger.info("ttfr_metrics_saved", path=str(csv_path))
-
         return metrics
 
-    def extract_template_metrics(self, days: int = 30) -> Dict[str, Any]:
+    def _ttfr_stats_pandas(
+        self,
+        leads: List[Dict[str, Any]],
+        sla_threshold: int,
+        csv_path: Path
+    ) -> Dict[str, Any]:
+        """Compute TTFR aggregates with pandas and write the CSV."""
+        df = pd.DataFrame(leads, columns=_TTFR_COLUMNS)
+        ttfr = df['Time_to_First_Response__c'].astype('float32')
+        df['ttfr_minutes'] = ttfr
+
+        df.to_csv(csv_path, index=False)
+
+        return {
+            "count": len(df),
+            "median": ttfr.median(),
+            "p95": ttfr.quantile(0.95),
+            "max": ttfr.max(),
+            "mean": ttfr.mean(),
+            "within_sla": (ttfr <= sla_threshold).sum(),
+            "breach_sla": (ttfr > sla_threshold).sum(),
+            "0-15min": (ttfr <= 15).sum(),
+            "15-30min": ((ttfr > 15) & (ttfr <= 30)).sum(),
+            "30-60min": ((ttfr > 30) & (ttfr <= 60)).sum(),
+            "60min+": (ttfr > 60).sum()
+        }
+
+    def _ttfr_stats_polars(
+        self,
+        leads: List[Dict[str, Any]],
+        sla_threshold: int,
+        csv_path: Path
+    ) -> Dict[str, Any]:
+        """Compute TTFR aggregates in a single Polars select and write the CSV."""
+        df = pl.from_dicts(
+            leads,
+            schema={
+                'Id': pl.Utf8,
+                'CreatedDate': pl.Utf8,
+                'First_Response_At__c': pl.Utf8,
+                'Time_to_First_Response__c': pl.Float64,
+                'OwnerId': pl.Utf8
+            }
+        ).with_columns(
+            pl.col('Time_to_First_Response__c').cast(pl.Float32).alias('ttfr_minutes')
+        )
+
+        df.write_csv(str(csv_path))
+
+        ttfr = pl.col('ttfr_minutes')
+        stats = df.select(
+            ttfr.median().alias("median"),
+            ttfr.quantile(0.95, interpolation='linear').alias("p95"),
+            ttfr.max().alias("max"),
+            ttfr.mean().alias("mean"),
+            (ttfr <= sla_threshold).sum().alias("within_sla"),
+            (ttfr > sla_threshold).sum().alias("breach_sla"),
+            (ttfr <= 15).sum().alias("0-15min"),
+            ((ttfr > 15) & (ttfr <= 30)).sum().alias("15-30min"),
+            ((ttfr > 30) & (ttfr <= 60)).sum().alias("30-60min"),
+            (ttfr > 60).sum().alias("60min+")
+        ).row(0, named=True)
+        stats["count"] = df.height
+
+        return stats
+
+    def extract_template_metrics(
+        self,
+        days: int = 30,
+        template_logs: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
         """
         Extract template suggestion metrics.
 
@@ -221,6 +344,7 @@ class MetricsExtractor:
 
         Args:
             days: Number of days to analyze
+            template_logs: Prefetched outreach.template_suggest logs (read from disk if None)
 
         Returns:
             Template metrics dictionary
@@ -228,27 +352,25 @@ class MetricsExtractor:
         logger.info("extracting_template_metrics", days=days)
 
         # Get flywheel logs for templates
-        template_logs = self.flywheel_logger.get_logs("outreach.template_suggest", days=days)
+        if template_logs is None:
+            template_logs = self.flywheel_logger.get_logs("outreach.template_suggest", days=days)
 
         if not template_logs:
             logger.warning("no_template_logs_found")
             return {"error": "No template logs found"}
 
-        # Convert to DataFrame
-        df_logs = pd.DataFrame(template_logs)
-
-        # Extract suggestions
+        # Extract suggestions (plain dicts; counting needs no DataFrame)
         suggestions = []
-        for _, row in df_logs.iterrows():
-            response = row.get('response', {})
-            metadata = row.get('metadata', {})
+        for log in template_logs:
+            response = log.get('response') or {}
+            metadata = log.get('metadata') or {}
 
-            if response and 'choices' in response:
+            if 'choices' in response:
                 content = response['choices'][0]['message']['content']
                 suggestion = json.loads(content)
 
                 suggestions.append({
-                    'timestamp': row.get('timestamp'),
+                    'timestamp': log.get('timestamp'),
                     'lead_id': metadata.get('lead_id'),
                     'template_id': suggestion.get('template_id'),
                     'intent': suggestion.get('intent_detected'),
@@ -256,24 +378,43 @@ class MetricsExtractor:
                     'reason': suggestion.get('reason', '')
                 })
 
-        df_suggestions = pd.DataFrame(suggestions)
+        total = len(suggestions)
+        by_template = Counter(s['template_id'] for s in suggestions if s['template_id'] is not None)
+        by_intent = Counter(s['intent'] for s in suggestions if s['intent'] is not None)
+
+        # Missing (None/NaN) confidences are left out, as in the routing metrics
+        confidences = [
+            s['confidence'] for s in suggestions
+            if s['confidence'] is not None and not isnan(s['confidence'])
+        ]
+        high = medium = low = 0
+        for confidence in confidences:
+            if confidence > 0.8:
+                high += 1
+            elif confidence >= 0.5:
+                medium += 1
+            else:
+                low += 1
 
         # Calculate metrics
         metrics = {
-            "total_suggestions": len(df_suggestions),
-            "by_template": df_suggestions['template_id'].value_counts().to_dict(),
-            "by_intent": df_suggestions['intent'].value_counts().to_dict(),
-            "avg_confidence": float(df_suggestions['confidence'].mean()),
+            "total_suggestions": total,
+            "by_template": dict(by_template.most_common()),
+            "by_intent": dict(by_intent.most_common()),
+            "avg_confidence": fsum(confidences) / len(confidences) if confidences else 0.0,
             "confidence_distribution": {
-                "high (>0.8)": int((df_suggestions['confidence'] > 0.8).sum()),
-                "medium (0.5-0.8)": int(((df_suggestions['confidence'] >= 0.5) & (df_suggestions['confidence'] <= 0.8)).sum()),
-                "low (<0.5)": int((df_suggestions['confidence'] < 0.5).sum())
+                "high (>0.8)": high,
+                "medium (0.5-0.8)": medium,
+                "low (<0.5)": low
             }
         }
 
         # Save to CSV
         csv_path = self.output_dir / f"template_metrics_{datetime.utcnow().strftime('%Y%m%d')}.csv"
-        df_suggestions.to_csv(csv_path, index=False)
+        with open(csv_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=_TEMPLATE_CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(suggestions)
         logger.info("template_metrics_saved", path=str(csv_path))
 
         return metrics
@@ -292,12 +433,35 @@ class MetricsExtractor:
 
         dashboard = {
             "generated_at": datetime.utcnow().isoformat() + "Z",
-            "period_days": days,
-            "routing": self.extract_routing_metrics(days),
-            "ttfr": self.extract_ttfr_metrics(days),
-            "templates": self.extract_template_metrics(days)
+            "period_days": days
         }
 
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # One pass over the log directory overlapped with one Salesforce round-trip
+            logs_future = executor.submit(self.flywheel_logger.get_logs_all, days)
+            leads_future = executor.submit(self.sf_client.batch_query, [
+                _TTFR_SOQL.format(days=days),
+                _LATENCY_SOQL.format(days=days)
+            ])
+            all_logs = logs_future.result()
+            ttfr_leads, latency_leads = leads_future.result()
+
+            futures = {
+                "routing": executor.submit(
+                    self.extract_routing_metrics,
+                    days,
+                    routing_logs=all_logs.get("lead.route", []),
+                    latency_leads=latency_leads
+                ),
+                "ttfr": executor.submit(self.extract_ttfr_metrics, days, leads=ttfr_leads),
+                "templates": executor.submit(
+                    self.extract_template_metrics,
+                    days,
+                    template_logs=all_logs.get("outreach.template_suggest", [])
+                )
+            }
+            dashboard.update({key: future.result() for key, future in futures.items()})
+
         # Save JSON dashboard
         json_path = self.output_dir / f"dashboard_{datetime.utcnow().strftime('%Y%m%d')}.json"
         with open(json_path, 'w') as f:
@@ -5,22 +5,59 @@ Implements server-to-server authentication using JWT tokens.
 Ref: https://help.salesforce.com/s/articleView?id=sf.remoteaccess_oauth_jwt_flow.htm
 """
 
+import base64
+import json
 import os
 import time
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
-import jwt
 import requests
-from cryptography.hazmat.primitives import serialization
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.backends import default_backend
 import structlog
 
 logger = structlog.get_logger()
 
 
+def _b64url(data: bytes) -> bytes:
+    """Base64url-encode without padding (RFC 7515)."""
+    return base64.urlsafe_b64encode(data).rstrip(b'=')
+
+
+# RS256 JWT header is constant, so encode it once
+_JWT_HEADER_B64 = _b64url(b'{"alg":"RS256","typ":"JWT"}')
+
+
+@lru_cache(maxsize=8)
+def _load_pem(path: str, mtime: float):
+    """
+    Load and parse a PEM private key, shared across auth instances.
+
+    Args:
+        path: Path to RSA private key file
+        mtime: File modification time (part of the cache key so edits reload)
+
+    Returns:
+        Parsed private key object
+    """
+    with open(path, 'rb') as key_file:
+        return serialization.load_pem_private_key(
+            key_file.read(),
+            password=None,
+            backend=default_backend()
+        )
+
+
 class SalesforceJWTAuth:
     """Handles JWT-based authentication for Salesforce."""
 
+    # Cached tokens are treated as expired this many seconds early
+    TOKEN_REFRESH_MARGIN = 300
+
     def __init__(
         self,
         instance_url: str,
@@ -49,18 +86,38 @@ class SalesforceJWTAuth:
         self._access_token: Optional[str] = None
         self._token_expires_at: Optional[datetime] = None
 
+        # Signed assertion cache (RSA signing is expensive)
+        self._cached_assertion: Optional[str] = None
+        self._assertion_valid_until: float = 0.0
+
         # Load private key
         self._private_key = self._load_private_key()
 
+        # Pooled HTTP session so token refreshes reuse the TLS connection
+        self._session = requests.Session()
+        self._session.mount('https://', HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['POST'])
+            )
+        ))
+
+    @property
+    def token_expires_at(self) -> Optional[datetime]:
+        """UTC time (naive) after which the cached token is refreshed, if any."""
+        return self._token_expires_at
+
     def _load_private_key(self) -> bytes:
         """Load RSA private key from file."""
         try:
-            with open(self.private_key_path, 'rb') as key_file:
-                private_key = serialization.load_pem_private_key(
-                    key_file.read(),
-                    password=None,
-                    backend=default_backend()
-                )
+            private_key = _load_pem(
+                self.private_key_path,
+                os.path.getmtime(self.private_key_path)
+            )
             logger.info("private_key_loaded", path=self.private_key_path)
             return private_key
         except Exception as e:
@@ -71,24 +128,34 @@ class SalesforceJWTAuth:
         """
         Create JWT assertion for Salesforce OAuth.
 
+        The signed assertion is reused until 60s before its own expiry, so
+        repeated token requests skip the RSA signing step.
+
         Returns:
             Signed JWT token string
         """
-        current_time = int(time.time())
+        now = time.time()
+        if self._cached_assertion and now < self._assertion_valid_until - 60:
+            return self._cached_assertion
+
+        expires_at = int(now) + self.token_expiry_seconds
 
         payload = {
             'iss': self.client_id,
             'sub': self.username,
             'aud': self.instance_url,
-            'exp': current_time + self.token_expiry_seconds
+            'exp': expires_at
         }
 
         # Sign JWT with RS256
-        token = jwt.encode(
-            payload,
-            self._private_key,
-            algorithm='RS256'
+        signing_input = _JWT_HEADER_B64 + b'.' + _b64url(
+            json.dumps(payload, separators=(',', ':')).encode('utf-8')
         )
+        signature = self._private_key.sign(signing_input, padding.PKCS1v15(), hashes.SHA256())
+        token = (signing_input + b'.' + _b64url(signature)).decode('ascii')
+
+        self._cached_assertion = token
+        self._assertion_valid_until = expires_at
 
         return token
 
@@ -111,7 +178,7 @@ class SalesforceJWTAuth:
         logger.info("requesting_access_token", url=token_url, username=self.username)
 
         try:
-            response = requests.post(
+            response = self._session.post(
                 token_url,
                 data=payload,
                 headers={'Content-Type': 'application/x-www-form-urlencoded'},
@@ -155,7 +222,7 @@ class SalesforceJWTAuth:
         self._access_token = token_data['access_token']
 
         # Set expiry with 5-minute buffer
-        self._token_expires_at = now + timedelta(seconds=self.token_expiry_seconds - 300)
+        self._token_expires_at = now + timedelta(seconds=self.token_expiry_seconds - self.TOKEN_REFRESH_MARGIN)
 
         logger.info("token_refreshed", expires_at=self._token_expires_at.isoformat())
 
@@ -4,36 +4,212 @@ Flywheel logging system.
 Captures all agent workload decisions for continuous optimization.
 """
 
+import io
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import structlog
 
+try:
+    import zstandard as zstd
+except ImportError:  # Optional: compressed log files
+    zstd = None
+
+try:
+    import msgspec
+except ImportError:  # Optional: typed, faster log encode/decode
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON when msgspec is unavailable
+    orjson = None
+
 logger = structlog.get_logger()
 
+LOG_SUFFIX = ".jsonl"
+COMPRESSED_LOG_SUFFIX = ".jsonl.zst"
+
+# Read buffer for log files; large reads mean fewer syscalls on big logs
+READ_BUFFER_SIZE = 64 * 1024
+
+
+if msgspec is not None:
+    class LogEntry(msgspec.Struct, omit_defaults=True):
+        """Flywheel log record schema, validated on decode."""
+        timestamp: str
+        client_id: str
+        workload_id: str
+        request: dict
+        response: dict
+        metadata: Optional[dict] = None
+
+    # Encoder/decoder are reused so parser setup happens once per process
+    _ENTRY_ENCODER = msgspec.json.Encoder()
+    _ENTRY_DECODER = msgspec.json.Decoder(LogEntry)
+
+
+def _encode_entry(log_entry: Dict[str, Any]) -> bytes:
+    """Serialize a log entry to a JSONL line."""
+    if msgspec is not None:
+        return _ENTRY_ENCODER.encode(LogEntry(**log_entry)) + b'\n'
+    if orjson is not None:
+        return orjson.dumps(log_entry, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(log_entry) + '\n').encode('utf-8')
+
+
+def _decode_entry(line) -> Dict[str, Any]:
+    """Parse (and, with msgspec, schema-validate) a JSONL line into a dict."""
+    if msgspec is not None:
+        entry = msgspec.structs.asdict(_ENTRY_DECODER.decode(line))
+        if entry["metadata"] is None:
+            del entry["metadata"]
+        return entry
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
 
 class FlywheelLogger:
     """Logs agent workload decisions in flywheel format."""
 
-    def __init__(self, client_id: str, log_path: str = "./logs/flywheel"):
+    # Request message for lead.route, filled from lead fields with per-field fallbacks
+    _LEAD_TEMPLATE = (
+        "Lead: {Company}; {NumberOfEmployees} employees; {Country}; "
+        "product={Product_Interest__c}"
+    )
+    _LEAD_DEFAULTS = {
+        "Company": "Unknown",
+        "NumberOfEmployees": "N/A",
+        "Country": "Unknown",
+        "Product_Interest__c": "Unknown"
+    }
+
+    def __init__(
+        self,
+        client_id: str,
+        log_path: str = "./logs/flywheel",
+        compress: bool = False,
+        flush_every: int = 1
+    ):
         """
         Initialize flywheel logger.
 
         Args:
             client_id: Client identifier (e.g., 'salesforce-prod')
             log_path: Directory for log files
+            compress: Write zstd-compressed .jsonl.zst files (requires zstandard)
+            flush_every: Entries buffered per log file before they are written
+                out (1 writes each entry as it is logged); flush() and close()
+                write any remainder
         """
         self.client_id = client_id
         self.log_path = Path(log_path)
         self.log_path.mkdir(parents=True, exist_ok=True)
 
-    def _get_log_file(self, workload_id: str) -> Path:
-        """Get log file path for workload."""
-        date_str = datetime.utcnow().strftime('%Y-%m-%d')
-        filename = f"{workload_id}_{date_str}.jsonl"
-        return self.log_path / filename
+        if compress and zstd is None:
+            logger.warning("zstandard_not_installed_writing_uncompressed_logs")
+            compress = False
+        self.compress = compress
+        self.flush_every = max(1, flush_every)
+
+        # Open writers, one per log file (the current day's files), the date
+        # each file is for, and the number of entries each holds that have
+        # not been flushed yet
+        self._writers: Dict[Path, Any] = {}
+        self._writer_dates: Dict[Path, str] = {}
+        self._unflushed: Dict[Path, int] = {}
+        self._writers_lock = threading.Lock()
+
+        # Log file paths by (workload_id, date), so hot writes skip path building
+        self._log_files: Dict[Tuple[str, str], Path] = {}
+
+    def _get_log_file(self, workload_id: str, date_str: Optional[str] = None) -> Path:
+        """
+        Get log file path for workload.
+
+        Args:
+            workload_id: Workload identifier
+            date_str: UTC date as YYYY-MM-DD (defaults to today)
+
+        Returns:
+            Path of the workload's log file for that date
+        """
+        if date_str is None:
+            date_str = datetime.utcnow().strftime('%Y-%m-%d')
+        key = (workload_id, date_str)
+        log_file = self._log_files.get(key)
+        if log_file is None:
+            if len(self._log_files) > 64:
+                self._log_files.clear()  # drop previous days' paths
+            suffix = COMPRESSED_LOG_SUFFIX if self.compress else LOG_SUFFIX
+            log_file = self._log_files[key] = self.log_path / f"{workload_id}_{date_str}{suffix}"
+        return log_file
+
+    def _write_line(self, log_file: Path, line: bytes, date_str: str) -> None:
+        """
+        Append a line to a log file through a persistent buffered writer.
+
+        Lines are flushed every flush_every entries. For compressed logs each
+        flush closes a zstd frame, so the file stays readable (and
+        appendable) even if the process stops without calling close().
+
+        Args:
+            log_file: Log file to append to
+            line: Encoded JSONL line
+            date_str: UTC date (YYYY-MM-DD) the log file is for
+        """
+        with self._writers_lock:
+            writer = self._writers.get(log_file)
+            if writer is None:
+                # Date rolled over: release writers for previous days' files
+                stale_files = [
+                    path for path, date in self._writer_dates.items()
+                    if date != date_str
+                ]
+                for stale_file in stale_files:
+                    self._writers.pop(stale_file).close()
+                    del self._writer_dates[stale_file]
+                    self._unflushed.pop(stale_file, None)
+
+                if self.compress:
+                    writer = zstd.ZstdCompressor(level=3).stream_writer(open(log_file, 'ab'))
+                else:
+                    writer = open(log_file, 'ab', buffering=64 * 1024)
+                self._writers[log_file] = writer
+                self._writer_dates[log_file] = date_str
+
+            writer.write(line)
+            self._unflushed[log_file] = self._unflushed.get(log_file, 0) + 1
+            if self._unflushed[log_file] >= self.flush_every:
+                self._flush_writer(log_file, writer)
+
+    def _flush_writer(self, log_file: Path, writer: Any) -> None:
+        """Write out one file's buffered lines; caller holds the writers lock."""
+        if self.compress:
+            writer.flush(zstd.FLUSH_FRAME)
+        else:
+            writer.flush()
+        self._unflushed[log_file] = 0
+
+    def flush(self) -> None:
+        """Write out buffered log lines for every open log file."""
+        with self._writers_lock:
+            for log_file, writer in self._writers.items():
+                if self._unflushed.get(log_file):
+                    self._flush_writer(log_file, writer)
+
+    def close(self) -> None:
+        """Flush and close any open log writers."""
+        with self._writers_lock:
+            for writer in self._writers.values():
+                writer.close()
+            self._writers.clear()
+            self._writer_dates.clear()
+            self._unflushed.clear()
 
     def log_decision(
         self,
@@ -51,8 +227,9 @@ class FlywheelLogger:
             response: Output from the workload (decisions, recommendations)
             metadata: Additional metadata (lead_id, user_id, etc.)
         """
+        timestamp = datetime.utcnow().isoformat() + "Z"
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": timestamp,
             "client_id": self.client_id,
             "workload_id": workload_id,
             "request": request,
@@ -62,11 +239,12 @@ class FlywheelLogger:
         if metadata:
             log_entry["metadata"] = metadata
 
-        log_file = self._get_log_file(workload_id)
+        # The entry's own timestamp picks the day's file (YYYY-MM-DD prefix)
+        date_str = timestamp[:10]
+        log_file = self._get_log_file(workload_id, date_str)
 
         try:
-            with open(log_file, 'a') as f:
-                f.write(json.dumps(log_entry) + '\n')
+            self._write_line(log_file, _encode_entry(log_entry), date_str)
 
             logger.info(
                 "flywheel_log_written",
@@ -97,10 +275,7 @@ class FlywheelLogger:
             "messages": [
                 {
                     "role": "user",
-                    "content": f"Lead: {lead_data.get('Company', 'Unknown')}; "
-                               f"{lead_data.get('NumberOfEmployees', 'N/A')} employees; "
-                               f"{lead_data.get('Country', 'Unknown')}; "
-                               f"product={lead_data.get('Product_Interest__c', 'Unknown')}"
+                    "content": self._LEAD_TEMPLATE.format_map({**self._LEAD_DEFAULTS, **lead_data})
                 }
             ],
             "model": model_used
@@ -210,24 +385,88 @@ class FlywheelLogger:
         Returns:
             List of log entries
         """
-        logs = []
+        return list(self.iter_logs(workload_id, days))
+
+    def iter_logs(self, workload_id: str, days: int = 7) -> Iterator[Dict[str, Any]]:
+        """
+        Stream logs for a workload without loading them all into memory.
+
+        Args:
+            workload_id: Workload identifier
+            days: Number of days to retrieve
+
+        Yields:
+            Log entries, newest day first
+        """
+        # Entries still buffered in this process must be on disk to be read
+        self.flush()
 
         for i in range(days):
             date = datetime.utcnow() - timedelta(days=i)
             date_str = date.strftime('%Y-%m-%d')
-            filename = f"{workload_id}_{date_str}.jsonl"
-            log_file = self.log_path / filename
 
-            if log_file.exists():
-                try:
-                    with open(log_file, 'r') as f:
-                        for line in f:
-                            logs.append(json.loads(line))
-                except Exception as e:
-                    logger.error("failed_to_read_flywheel_log", error=str(e), file=str(log_file))
+            for suffix in (LOG_SUFFIX, COMPRESSED_LOG_SUFFIX):
+                log_file = self.log_path / f"{workload_id}_{date_str}{suffix}"
+                if log_file.exists():
+                    yield from self._iter_log_file(log_file)
+
+    def get_logs_all(self, days: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Retrieve logs for every workload with a single directory scan.
+
+        Args:
+            days: Number of days to retrieve
+
+        Returns:
+            Dictionary of workload_id -> list of log entries
+        """
+        self.flush()
+        date_strs = {
+            (datetime.utcnow() - timedelta(days=i)).strftime('%Y-%m-%d')
+            for i in range(days)
+        }
+        logs: Dict[str, List[Dict[str, Any]]] = {}
+
+        # scandir yields names from readdir directly; only matching files
+        # become Path objects
+        with os.scandir(self.log_path) as entries:
+            names = sorted((entry.name for entry in entries if entry.is_file()), reverse=True)
+
+        for name in names:
+            if name.endswith(COMPRESSED_LOG_SUFFIX):
+                base = name[:-len(COMPRESSED_LOG_SUFFIX)]
+            elif name.endswith(LOG_SUFFIX):
+                base = name[:-len(LOG_SUFFIX)]
+            else:
+                continue
+
+            workload_id, _, date_str = base.rpartition('_')
+            if not workload_id or date_str not in date_strs:
+                continue
+
+            log_file = self.log_path / name
+            logs.setdefault(workload_id, []).extend(self._iter_log_file(log_file))
 
         return logs
 
+    def _iter_log_file(self, log_file: Path) -> Iterator[Dict[str, Any]]:
+        """Yield entries from a plain or zstd-compressed log file, line by line."""
+        try:
+            if log_file.name.endswith(COMPRESSED_LOG_SUFFIX):
+                if zstd is None:
+                    logger.error("zstandard_not_installed_cannot_read_log", file=str(log_file))
+                    return
+                with open(log_file, 'rb') as raw:
+                    reader = zstd.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+                    for line in io.BufferedReader(reader, buffer_size=READ_BUFFER_SIZE):
+                        yield _decode_entry(line)
+            else:
+                with open(log_file, 'rb', buffering=READ_BUFFER_SIZE) as f:
+                    for line in f:
+                        yield _decode_entry(line)
+        except Exception as e:
+            logger.error("failed_to_read_flywheel_log", error=str(e), file=str(log_file))
+
 
 def create_logger_from_env() -> FlywheelLogger:
     """
@@ -236,11 +475,21 @@ def create_logger_from_env() -> FlywheelLogger:
     Required environment variables:
         - FLYWHEEL_CLIENT_ID
         - FLYWHEEL_LOG_PATH (optional, defaults to ./logs/flywheel)
+        - FLYWHEEL_COMPRESS (optional, '1' writes zstd-compressed logs)
+        - FLYWHEEL_FLUSH_EVERY (optional, entries buffered per file before
+          writing; defaults to 1)
 
     Returns:
         Configured FlywheelLogger instance
     """
     client_id = os.getenv('FLYWHEEL_CLIENT_ID', 'salesforce-prod')
     log_path = os.getenv('FLYWHEEL_LOG_PATH', './logs/flywheel')
-
-    return FlywheelLogger(client_id=client_id, log_path=log_path)
+    compress = os.getenv('FLYWHEEL_COMPRESS', '0') == '1'
+    flush_every = int(os.getenv('FLYWHEEL_FLUSH_EVERY', '1'))
+
+    return FlywheelLogger(
+        client_id=client_id,
+        log_path=log_path,
+        compress=compress,
+        flush_every=flush_every
+    )
@@ -6,15 +6,38 @@ to trigger agent workloads in real-time.
 """
 
 import asyncio
+import io
 import json
 import os
+import random
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
 import structlog
+import aiohttp
 from aiohttp import ClientSession
 import time
 
-logger = structlog.get_logger()
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encode/decode
+    orjson = None
+
+try:
+    import grpc
+    import avro.io
+    import avro.schema
+except ImportError:  # Optional: only needed for PubSubCDCListener
+    grpc = None
+
+logger = structlog.get_logger().bind(component="cdc_listener")
+
+# Resolved once so per-event debug logging costs a single branch when disabled
+_DEBUG_ENABLED = os.getenv('LOG_LEVEL', 'INFO').upper() == 'DEBUG'
+
+
+def _jittered(backoff: float) -> float:
+    """Reconnect delay: the backoff plus up to 30% jitter, so clients spread out."""
+    return backoff + random.uniform(0, backoff * 0.3)
 
 
 class CDCListener:
@@ -25,6 +48,21 @@ class CDCListener:
     the Salesforce Pub/Sub API (gRPC) or a robust CometD client library.
     """
 
+    # Reconnect backoff bounds (seconds)
+    INITIAL_BACKOFF = 1.0
+    MAX_BACKOFF = 60.0
+
+    # Long-poll hold time assumed until the server's advice says otherwise
+    DEFAULT_ADVICE_TIMEOUT_MS = 110000
+
+    # Received events are buffered here and drained by worker tasks so a
+    # slow handler never stalls the long-poll receive loop
+    QUEUE_SIZE = 1024
+    NUM_WORKERS = 4
+
+    # Emit one received-events info line per this many events
+    LOG_EVERY_N_EVENTS = 100
+
     def __init__(
         self,
         instance_url: str,
@@ -46,8 +84,27 @@ class CDCListener:
 
         self.client_id: Optional[str] = None
         self.session: Optional[ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
         self.message_id = 0
 
+        # /meta/connect is sent on every long-poll; keep its body as a bytes
+        # template and only splice in the client and message IDs
+        self._connect_tmpl = (
+            b'[{"channel":"/meta/connect","clientId":"__CID__",'
+            b'"connectionType":"long-polling","id":"__ID__"}]'
+        )
+        self._connect_body: Optional[bytes] = None
+        self._connect_body_cid: Optional[str] = None
+
+        # Reconnect state: current backoff and the server's latest CometD advice
+        self._backoff = self.INITIAL_BACKOFF
+        self._advice: Dict[str, Any] = {}
+
+        # Receive loop -> handler workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._workers: list = []
+        self._events_received = 0
+
         # Event handlers
         self.handlers: Dict[str, callable] = {}
 
@@ -62,10 +119,40 @@ class CDCListener:
         self.handlers[channel] = handler
         logger.info("handler_registered", channel=channel)
 
-    async def _get_next_message_id(self) -> int:
-        """Get next message ID for CometD."""
+    def _next_id(self) -> str:
+        """Get next message ID for CometD, formatted for the wire."""
         self.message_id += 1
-        return self.message_id
+        return str(self.message_id)
+
+    async def _post_json(
+        self,
+        payload: Any,
+        timeout: Optional[aiohttp.ClientTimeout] = None
+    ) -> Any:
+        """
+        POST a CometD message and decode the JSON reply.
+
+        Content-Type is set once on the session, so the body goes out as raw
+        bytes without aiohttp re-encoding it.
+
+        Args:
+            payload: Message list, or an already-encoded bytes body
+            timeout: Per-request timeout (defaults to the session's)
+
+        Returns:
+            Decoded response
+        """
+        if not isinstance(payload, bytes):
+            payload = (
+                orjson.dumps(payload) if orjson is not None
+                else json.dumps(payload).encode("utf-8")
+            )
+
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        async with self.session.post(self.cometd_url, data=payload, **kwargs) as response:
+            raw = await response.read()
+
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
     async def _handshake(self) -> bool:
         """
@@ -79,29 +166,22 @@ class CDCListener:
             "version": "1.0",
             "minimumVersion": "1.0",
             "supportedConnectionTypes": ["long-polling"],
-            "id": str(await self._get_next_message_id())
+            "id": self._next_id()
         }]
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-
         try:
-            async with self.session.post(
-                self.cometd_url,
-                json=message,
-                headers=headers
-            ) as response:
-                result = await response.json()
-
-                if result and result[0].get("successful"):
-                    self.client_id = result[0].get("clientId")
-                    logger.info("cdc_handshake_successful", client_id=self.client_id)
-                    return True
-                else:
-                    logger.error("cdc_handshake_failed", result=result)
-                    return False
+            result = await self._post_json(message)
+
+            if result and result[0].get("advice"):
+                self._advice.update(result[0]["advice"])
+
+            if result and result[0].get("successful"):
+                self.client_id = result[0].get("clientId")
+                logger.info("cdc_handshake_successful", client_id=self.client_id)
+                return True
+            else:
+                logger.error("cdc_handshake_failed", result=result)
+                return False
 
         except Exception as e:
             logger.error("cdc_handshake_error", error=str(e))
@@ -121,28 +201,18 @@ class CDCListener:
             "channel": "/meta/subscribe",
             "clientId": self.client_id,
             "subscription": channel,
-            "id": str(await self._get_next_message_id())
+            "id": self._next_id()
         }]
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
-
         try:
-            async with self.session.post(
-                self.cometd_url,
-                json=message,
-                headers=headers
-            ) as response:
-                result = await response.json()
-
-                if result and result[0].get("successful"):
-                    logger.info("cdc_subscription_successful", channel=channel)
-                    return True
-                else:
-                    logger.error("cdc_subscription_failed", channel=channel, result=result)
-                    return False
+            result = await self._post_json(message)
+
+            if result and result[0].get("successful"):
+                logger.info("cdc_subscription_successful", channel=channel)
+                return True
+            else:
+                logger.error("cdc_subscription_failed", channel=channel, result=result)
+                return False
 
         except Exception as e:
             logger.error("cdc_subscription_error", channel=channel, error=str(e))
@@ -155,28 +225,22 @@ class CDCListener:
         Returns:
             List of received messages or None
         """
-        message = [{
-            "channel": "/meta/connect",
-            "clientId": self.client_id,
-            "connectionType": "long-polling",
-            "id": str(await self._get_next_message_id())
-        }]
+        if self._connect_body_cid != self.client_id:
+            self._connect_body = self._connect_tmpl.replace(
+                b"__CID__", self.client_id.encode()
+            )
+            self._connect_body_cid = self.client_id
+        body = self._connect_body.replace(
+            b"__ID__", self._next_id().encode()
+        )
 
-        headers = {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        # The server holds the long-poll open for up to advice.timeout ms;
+        # bound only the socket read, with headroom past that
+        hold = self._advice.get("timeout", self.DEFAULT_ADVICE_TIMEOUT_MS) / 1000.0
+        timeout = aiohttp.ClientTimeout(total=None, sock_read=hold + 20)
 
         try:
-            # Long-polling with extended timeout
-            async with self.session.post(
-                self.cometd_url,
-                json=message,
-                headers=headers,
-                timeout=120
-            ) as response:
-                result = await response.json()
-                return result
+            return await self._post_json(body, timeout=timeout)
 
         except asyncio.TimeoutError:
             # Timeout is expected in long-polling
@@ -185,6 +249,37 @@ class CDCListener:
             logger.error("cdc_connect_error", error=str(e))
             return None
 
+    async def _wait_before_reconnect(self):
+        """Sleep for the current backoff plus jitter, then double it."""
+        delay = _jittered(self._backoff)
+        self._backoff = min(self._backoff * 2, self.MAX_BACKOFF)
+        logger.info("cdc_reconnect_backoff", delay=round(delay, 2))
+        await asyncio.sleep(delay)
+
+    async def _enqueue(self, message: Dict[str, Any]):
+        """
+        Hand a received message to the workers, waiting for room on overflow.
+
+        Waiting holds back the next /meta/connect, so a backlog stays with
+        the server rather than events being dropped here (CometD has no
+        replay to recover them).
+
+        Args:
+            message: CometD message from a /meta/connect response
+        """
+        if self._queue.full():
+            logger.warning("cdc_queue_full_waiting", size=self.QUEUE_SIZE)
+        await self._queue.put(message)
+
+    async def _worker(self):
+        """Drain the message queue and run handlers."""
+        while True:
+            message = await self._queue.get()
+            try:
+                await self._process_message(message)
+            finally:
+                self._queue.task_done()
+
     async def _process_message(self, message: Dict[str, Any]):
         """
         Process a CDC event message.
@@ -197,7 +292,11 @@ class CDCListener:
         if not channel or channel.startswith("/meta/"):
             return
 
-        logger.info("cdc_event_received", channel=channel)
+        self._events_received += 1
+        if _DEBUG_ENABLED:
+            logger.debug("cdc_event_received", channel=channel)
+        elif self._events_received % self.LOG_EVERY_N_EVENTS == 1:
+            logger.info("cdc_events_received", channel=channel, total=self._events_received)
 
         # Extract event data
         data = message.get("data", {})
@@ -218,7 +317,23 @@ class CDCListener:
         """Start listening to CDC events."""
         logger.info("starting_cdc_listener")
 
-        self.session = ClientSession()
+        # One keep-alive connection pool for the listener's lifetime, so
+        # re-handshakes and long-polls reuse the same TCP+TLS connection
+        self._connector = aiohttp.TCPConnector(
+            limit=4,
+            keepalive_timeout=300,
+            enable_cleanup_closed=True
+        )
+        self.session = ClientSession(
+            connector=self._connector,
+            headers={
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json"
+            },
+            # Handshake/subscribe replies are immediate; /meta/connect sets its
+            # own read timeout from the server's advice
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=30)
+        )
 
         # Handshake
         if not await self._handshake():
@@ -229,6 +344,10 @@ class CDCListener:
         for channel in self.handlers.keys():
             await self._subscribe(channel)
 
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.NUM_WORKERS)
+        ]
+
         # Listen loop
         logger.info("cdc_listener_active")
 
@@ -237,22 +356,275 @@ class CDCListener:
 
             if messages is None:
                 logger.error("cdc_connection_lost_reconnecting")
-                await asyncio.sleep(5)
-                # Re-handshake
-                await self._handshake()
+                await self._wait_before_reconnect()
+                # Re-handshake (and re-subscribe on the new client ID)
+                if await self._handshake():
+                    for channel in self.handlers.keys():
+                        await self._subscribe(channel)
                 continue
 
-            # Process messages
+            connect_reply = next(
+                (m for m in messages if m.get("channel") == "/meta/connect"),
+                None
+            )
+            if connect_reply is not None:
+                if connect_reply.get("advice"):
+                    self._advice.update(connect_reply["advice"])
+
+                if not connect_reply.get("successful"):
+                    reconnect = self._advice.get("reconnect", "handshake")
+                    logger.warning(
+                        "cdc_connect_unsuccessful",
+                        error=connect_reply.get("error"),
+                        reconnect=reconnect
+                    )
+                    if reconnect == "none":
+                        logger.error("cdc_server_advised_no_reconnect")
+                        return
+                    await self._wait_before_reconnect()
+                    if reconnect == "handshake" and await self._handshake():
+                        for channel in self.handlers.keys():
+                            await self._subscribe(channel)
+                    continue
+
+            # Healthy connect: start the next outage from the initial backoff
+            self._backoff = self.INITIAL_BACKOFF
+
+            # Queue messages for the handler workers
             for message in messages:
-                await self._process_message(message)
+                await self._enqueue(message)
+
+            # Honor the server's requested pause between connects (ms)
+            interval = self._advice.get("interval", 0)
+            if interval:
+                await asyncio.sleep(interval / 1000)
 
     async def stop(self):
         """Stop listening."""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
         if self.session:
             await self.session.close()
+        if self._connector:
+            await self._connector.close()
         logger.info("cdc_listener_stopped")
 
 
+class PubSubCDCListener:
+    """
+    Listens to Salesforce CDC events via the Pub/Sub API (gRPC streaming).
+
+    Events arrive over one persistent TLS connection as Avro payloads, which
+    are decoded with the topic schema and handed to the same handler map as
+    CDCListener.
+
+    Requires grpcio and avro, plus the Python stubs generated from
+    Salesforce's pubsub_api.proto:
+
+        python -m grpc_tools.protoc -I <proto_dir> --python_out=src/listeners \\
+            --grpc_python_out=src/listeners <proto_dir>/pubsub_api.proto
+    """
+
+    PUBSUB_ENDPOINT = "api.pubsub.salesforce.com:7443"
+
+    # Same reconnect backoff and event log sampling as CDCListener
+    INITIAL_BACKOFF = CDCListener.INITIAL_BACKOFF
+    MAX_BACKOFF = CDCListener.MAX_BACKOFF
+    LOG_EVERY_N_EVENTS = CDCListener.LOG_EVERY_N_EVENTS
+
+    def __init__(
+        self,
+        instance_url: str,
+        token_provider: Callable[[], str],
+        tenant_id: str,
+        endpoint: str = PUBSUB_ENDPOINT,
+        batch_size: int = 100
+    ):
+        """
+        Initialize Pub/Sub listener.
+
+        Args:
+            instance_url: Salesforce instance URL
+            token_provider: Returns a valid OAuth access token (e.g.
+                SalesforceJWTAuth.get_access_token); called before each
+                (re)connect so streams outlive a single token
+            tenant_id: Salesforce org ID
+            endpoint: Pub/Sub API host:port
+            batch_size: Events requested per FetchRequest (flow control)
+        """
+        self.instance_url = instance_url.rstrip('/')
+        self.token_provider = token_provider
+        self.access_token: Optional[str] = None
+        self.tenant_id = tenant_id
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+
+        self.handlers: Dict[str, callable] = {}
+        self.channel = None
+        self._tasks: list = []
+        self._events_received = 0
+
+        # Last replay ID per topic, used to resume after a dropped stream
+        self.replay_ids: Dict[str, bytes] = {}
+        self._schemas: Dict[str, Any] = {}
+
+    @property
+    def _metadata(self) -> tuple:
+        """gRPC call metadata identifying the org and session."""
+        return (
+            ('accesstoken', self.access_token),
+            ('instanceurl', self.instance_url),
+            ('tenantid', self.tenant_id)
+        )
+
+    def register_handler(self, channel: str, handler: callable):
+        """
+        Register event handler for a CDC channel.
+
+        Args:
+            channel: CDC channel name (e.g., '/data/LeadChangeEvent')
+            handler: Async function to handle events
+        """
+        self.handlers[channel] = handler
+        logger.info("handler_registered", channel=channel)
+
+    async def _get_schema(self, stub, pb2, schema_id: str):
+        """Fetch and cache the Avro schema for an event."""
+        schema = self._schemas.get(schema_id)
+        if schema is None:
+            info = await stub.GetSchema(pb2.SchemaRequest(schema_id=schema_id), metadata=self._metadata)
+            schema = avro.schema.parse(info.schema_json)
+            self._schemas[schema_id] = schema
+        return schema
+
+    async def _fetch_requests(self, queue: asyncio.Queue):
+        """Stream FetchRequests to the server as they are queued."""
+        while True:
+            request = await queue.get()
+            if request is None:
+                return
+            yield request
+
+    async def _subscribe(self, stub, pb2, topic: str, handler: callable):
+        """Consume one topic's event stream, resuming from the last replay ID."""
+        backoff = self.INITIAL_BACKOFF
+        while True:
+            queue: asyncio.Queue = asyncio.Queue()
+            replay_id = self.replay_ids.get(topic)
+            if replay_id:
+                first = pb2.FetchRequest(
+                    topic_name=topic,
+                    replay_preset=pb2.ReplayPreset.CUSTOM,
+                    replay_id=replay_id,
+                    num_requested=self.batch_size
+                )
+            else:
+                first = pb2.FetchRequest(
+                    topic_name=topic,
+                    replay_preset=pb2.ReplayPreset.LATEST,
+                    num_requested=self.batch_size
+                )
+            queue.put_nowait(first)
+
+            try:
+                # Token provider may refresh over the network; keep it off the loop
+                self.access_token = await asyncio.to_thread(self.token_provider)
+
+                async for response in stub.Subscribe(self._fetch_requests(queue), metadata=self._metadata):
+                    # Stream is healthy: start the next outage from the initial backoff
+                    backoff = self.INITIAL_BACKOFF
+
+                    for consumer_event in response.events:
+                        try:
+                            schema = await self._get_schema(stub, pb2, consumer_event.event.schema_id)
+                            decoder = avro.io.BinaryDecoder(io.BytesIO(consumer_event.event.payload))
+                            payload = avro.io.DatumReader(schema).read(decoder)
+                        except Exception as e:
+                            logger.error(
+                                "pubsub_event_decode_error",
+                                channel=topic,
+                                event_id=consumer_event.event.id,
+                                error=str(e)
+                            )
+                            continue
+
+                        self._events_received += 1
+                        if _DEBUG_ENABLED:
+                            logger.debug("cdc_event_received", channel=topic)
+                        elif self._events_received % self.LOG_EVERY_N_EVENTS == 1:
+                            logger.info("cdc_events_received", channel=topic, total=self._events_received)
+
+                        try:
+                            await handler(payload)
+                        except Exception as e:
+                            logger.error("handler_error", channel=topic, error=str(e))
+
+                    self.replay_ids[topic] = response.latest_replay_id
+
+                    # Flow control: ask for more once the outstanding batch is used up
+                    if response.pending_num_requested == 0:
+                        queue.put_nowait(pb2.FetchRequest(topic_name=topic, num_requested=self.batch_size))
+
+            except grpc.aio.AioRpcError as e:
+                logger.error("pubsub_stream_error", channel=topic, code=str(e.code()), error=e.details())
+            except Exception as e:
+                logger.error("pubsub_stream_error", channel=topic, error=str(e))
+            finally:
+                queue.put_nowait(None)
+
+            delay = _jittered(backoff)
+            backoff = min(backoff * 2, self.MAX_BACKOFF)
+            logger.error("pubsub_stream_lost_reconnecting", channel=topic, delay=round(delay, 2))
+            await asyncio.sleep(delay)
+
+    async def start(self):
+        """Start listening to CDC events."""
+        if grpc is None:
+            raise ImportError("PubSubCDCListener requires the grpcio and avro packages")
+        try:
+            from src.listeners import pubsub_api_pb2 as pb2
+            from src.listeners import pubsub_api_pb2_grpc as pb2_grpc
+        except ImportError as e:
+            raise ImportError(
+                "Pub/Sub API stubs not found; generate pubsub_api_pb2*.py from pubsub_api.proto"
+            ) from e
+
+        logger.info("starting_pubsub_listener", endpoint=self.endpoint)
+
+        self.channel = grpc.aio.secure_channel(self.endpoint, grpc.ssl_channel_credentials())
+        stub = pb2_grpc.PubSubStub(self.channel)
+
+        logger.info("cdc_listener_active")
+
+        # One task per topic; a failure in one stream never stops the others
+        self._tasks = [
+            asyncio.create_task(self._subscribe(stub, pb2, topic, handler))
+            for topic, handler in self.handlers.items()
+        ]
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def stop(self):
+        """Stop listening."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.channel:
+            await self.channel.close()
+        logger.info("cdc_listener_stopped")
+
+
+# Fields the workload handlers read from polled records; anything else is
+# wasted payload. SystemModstamp and Id must stay: they form the poll cursor.
+POLL_FIELDS: Dict[str, list] = {
+    'Lead': ['Id', 'SystemModstamp', 'Status', 'Company', 'Email'],
+    'Task': ['Id', 'WhoId', 'Status', 'SystemModstamp'],
+    'EmailMessage': ['Id', 'RelatedToId', 'MessageDate', 'SystemModstamp'],
+}
+
+
 class PollingListener:
     """
     Alternative polling-based listener for environments without CDC access.
@@ -260,10 +632,15 @@ class PollingListener:
     Polls Salesforce REST API for new records at regular intervals.
     """
 
+    # Records per poll query; a full page is followed immediately by the next
+    PAGE_SIZE = 200
+
     def __init__(
         self,
         sf_client,
-        poll_interval: int = 60
+        poll_interval: int = 60,
+        max_concurrent_handlers: int = 5,
+        bulk_backfill: bool = True
     ):
         """
         Initialize polling listener.
@@ -271,12 +648,24 @@ class PollingListener:
         Args:
             sf_client: SalesforceAPIClient instance
             poll_interval: Polling interval in seconds
+            max_concurrent_handlers: Cap on handlers running at once (bounds
+                concurrent Salesforce API calls)
+            bulk_backfill: Catch up the initial window via Bulk API 2.0
+                before switching to REST polling
         """
         self.sf_client = sf_client
         self.poll_interval = poll_interval
         self.handlers: Dict[str, callable] = {}
         self.last_poll_times: Dict[str, str] = {}
+        self.last_poll_ids: Dict[str, str] = {}
         self.running = False
+        self._handler_semaphore = asyncio.Semaphore(max_concurrent_handlers)
+        self.bulk_backfill = bulk_backfill
+
+        # Cold-start window (last hour), encoded once as a SOQL datetime literal
+        self._bootstrap_iso = (
+            datetime.utcnow() - timedelta(hours=1)
+        ).strftime('%Y-%m-%dT%H:%M:%S.000Z')
 
     def register_handler(self, sobject_type: str, handler: callable):
         """
@@ -289,46 +678,102 @@ class PollingListener:
         self.handlers[sobject_type] = handler
         logger.info("polling_handler_registered", sobject=sobject_type)
 
+    async def _dispatch(self, sobject_type: str, handler: callable, records: list):
+        """Run the handler over records, bounded by the handler semaphore."""
+        async def _run(record: Dict[str, Any]):
+            async with self._handler_semaphore:
+                try:
+                    await handler(record)
+                except Exception as e:
+                    logger.error(
+                        "polling_handler_error",
+                        sobject=sobject_type,
+                        record_id=record.get("Id"),
+                        error=str(e)
+                    )
+
+        await asyncio.gather(*(_run(record) for record in records))
+
+    async def _backfill(self, sobject_type: str):
+        """
+        Catch up on the initial window with one Bulk API 2.0 job.
+
+        Runs on cold start (no cursor yet) so the first REST poll only has to
+        pick up changes made while the job was running. Falls back to plain
+        REST polling if the bulk job fails.
+        """
+        handler = self.handlers.get(sobject_type)
+        if not handler or sobject_type in self.last_poll_times:
+            return
+
+        since = self._bootstrap_iso
+        fields = ','.join(POLL_FIELDS.get(sobject_type, ['Id', 'SystemModstamp']))
+        soql = f"SELECT {fields} FROM {sobject_type} WHERE SystemModstamp > {since}"
+
+        try:
+            records = await asyncio.to_thread(
+                lambda: list(self.sf_client.bulk_query(soql))
+            )
+        except Exception as e:
+            logger.error("polling_backfill_error", sobject=sobject_type, error=str(e))
+            return
+
+        logger.info("polling_backfill_complete", sobject=sobject_type, count=len(records))
+
+        if records:
+            await self._dispatch(sobject_type, handler, records)
+            # Bulk results are unordered; the cursor is the greatest (ts, Id)
+            last = max(records, key=lambda r: (r["SystemModstamp"], r["Id"]))
+            self.last_poll_times[sobject_type] = last["SystemModstamp"]
+            self.last_poll_ids[sobject_type] = last["Id"]
+        else:
+            self.last_poll_times[sobject_type] = since
+
     async def _poll_object(self, sobject_type: str):
         """Poll for new records of a specific SObject type."""
         handler = self.handlers.get(sobject_type)
         if not handler:
             return
 
-        # Get last poll time or default to last hour
-        last_poll = self.last_poll_times.get(
-            sobject_type,
-            (datetime.utcnow() - timedelta(hours=1)).isoformat() + "Z"
-        )
+        # Get last poll time or default to the bootstrap window
+        last_poll = self.last_poll_times.setdefault(sobject_type, self._bootstrap_iso)
 
-        # Query for new/updated records
-        soql = f"""
-            SELECT FIELDS(STANDARD)
-            FROM {sobject_type}
-            WHERE SystemModstamp > {last_poll}
-            ORDER BY SystemModstamp ASC
-            LIMIT 100
-        """
+        fields = ','.join(POLL_FIELDS.get(sobject_type, ['Id', 'SystemModstamp']))
 
         try:
-            records = self.sf_client.query(soql)
+            while True:
+                # Keyset cursor on (SystemModstamp, Id) pages stably through
+                # records that share a timestamp
+                last_id = self.last_poll_ids.get(sobject_type)
+                if last_id:
+                    where = (
+                        f"SystemModstamp > {last_poll} OR "
+                        f"(SystemModstamp = {last_poll} AND Id > '{last_id}')"
+                    )
+                else:
+                    where = f"SystemModstamp > {last_poll}"
+
+                soql = (
+                    f"SELECT {fields} FROM {sobject_type} "
+                    f"WHERE {where} "
+                    f"ORDER BY SystemModstamp ASC, Id ASC "
+                    f"LIMIT {self.PAGE_SIZE}"
+                )
+
+                records = await self.sf_client.aquery(soql)
+                if not records:
+                    break
 
-            if records:
                 logger.info("polling_found_records", sobject=sobject_type, count=len(records))
+                await self._dispatch(sobject_type, handler, records)
 
-                for record in records:
-                    try:
-                        await handler(record)
-                    except Exception as e:
-                        logger.error(
-                            "polling_handler_error",
-                            sobject=sobject_type,
-                            record_id=record.get("Id"),
-                            error=str(e)
-                        )
+                # Results are ordered by the cursor, so the last row advances it
+                last_poll = records[-1]["SystemModstamp"]
+                self.last_poll_times[sobject_type] = last_poll
+                self.last_poll_ids[sobject_type] = records[-1]["Id"]
 
-                # Update last poll time
-                self.last_poll_times[sobject_type] = records[-1]["SystemModstamp"]
+                if len(records) < self.PAGE_SIZE:
+                    break
 
         except Exception as e:
             logger.error("polling_query_error", sobject=sobject_type, error=str(e))
@@ -338,9 +783,16 @@ class PollingListener:
         self.running = True
         logger.info("polling_listener_started", interval=self.poll_interval)
 
+        if self.bulk_backfill:
+            await asyncio.gather(
+                *(self._backfill(sobject_type) for sobject_type in list(self.handlers.keys()))
+            )
+
         while self.running:
-            for sobject_type in self.handlers.keys():
-                await self._poll_object(sobject_type)
+            # Poll all SObject types concurrently; cycle time is the slowest query
+            await asyncio.gather(
+                *(self._poll_object(sobject_type) for sobject_type in list(self.handlers.keys()))
+            )
 
             await asyncio.sleep(self.poll_interval)
 
@@ -5,28 +5,47 @@ Starts CDC listener and wires workloads to handle events.
 """
 
 import asyncio
+import logging
 import os
 import signal
 import sys
+from typing import Any, Callable, Dict, Optional, Set, Tuple
 from dotenv import load_dotenv
 import structlog
 
-# Configure structured logging
+try:
+    import orjson
+except ImportError:  # Optional: faster log rendering
+    orjson = None
+
+# Configure structured logging; calls below LOG_LEVEL are no-ops. With
+# orjson, events render straight to bytes and skip stdlib json.dumps.
 structlog.configure(
     processors=[
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.add_log_level,
-        structlog.processors.JSONRenderer()
-    ]
+        structlog.processors.JSONRenderer(serializer=orjson.dumps) if orjson is not None
+        else structlog.processors.JSONRenderer()
+    ],
+    wrapper_class=structlog.make_filtering_bound_logger(
+        logging.getLevelName(os.getenv('LOG_LEVEL', 'INFO').upper())
+    ),
+    logger_factory=structlog.BytesLoggerFactory() if orjson is not None
+    else structlog.PrintLoggerFactory(),
+    cache_logger_on_first_use=True
 )
 
 logger = structlog.get_logger()
 
+# Key prefix of Salesforce Lead record IDs
+_LEAD_PREFIX = '00Q'
+
 # Import components
 from src.auth.jwt_auth import create_auth_from_env
 from src.salesforce.api_client import SalesforceAPIClient
 from src.flywheel.logger import create_logger_from_env
-from src.listeners.cdc_listener import CDCListener, PollingListener
+from src.listeners import cdc_listener
+from src.listeners.cdc_listener import CDCListener, PollingListener, PubSubCDCListener
 from src.workloads.lead_route import LeadRouter
 from src.workloads.first_touch_detect import FirstTouchDetector
 from src.workloads.template_suggest import TemplateSuggester
@@ -35,6 +54,9 @@ from src.workloads.template_suggest import TemplateSuggester
 class FlywheelIntegration:
     """Main integration orchestrator."""
 
+    # CDC events for the same record within this window are handled once
+    DEBOUNCE_SECONDS = 0.5
+
     def __init__(self, use_polling: bool = False):
         """
         Initialize Flywheel integration.
@@ -57,11 +79,19 @@ class FlywheelIntegration:
 
         # Initialize listener
         self.use_polling = use_polling
+        # Event shape is fixed for the process lifetime; pick the extractor once
+        self._extract_ids = self._extract_polling if use_polling else self._extract_cdc
         if use_polling:
             self.listener = PollingListener(
                 sf_client=self.sf_client,
                 poll_interval=int(os.getenv('POLL_INTERVAL', '60'))
             )
+        elif self._use_pubsub():
+            self.listener = PubSubCDCListener(
+                instance_url=self.auth.instance_url,
+                token_provider=self.auth.get_access_token,
+                tenant_id=os.getenv('SF_ORG_ID')
+            )
         else:
             access_token = self.auth.get_access_token()
             self.listener = CDCListener(
@@ -70,14 +100,102 @@ class FlywheelIntegration:
                 api_version=os.getenv('SF_API_VERSION', '59.0')
             )
 
+        # Per-record CDC debounce state, keyed by (handler name, record ID)
+        self._pending: Dict[Tuple[str, str], Tuple[Callable[[dict], Any], dict]] = {}
+        self._timers: Dict[Tuple[str, str], asyncio.TimerHandle] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
+
         # Register event handlers
         self._register_handlers()
 
         logger.info(
             "flywheel_integration_initialized",
-            mode="polling" if use_polling else "cdc"
+            mode="polling" if use_polling else type(self.listener).__name__
         )
 
+    def _use_pubsub(self) -> bool:
+        """Use the Pub/Sub API listener when enabled and its dependencies are present."""
+        if os.getenv('CDC_USE_PUBSUB', 'false').lower() != 'true':
+            return False
+        if cdc_listener.grpc is None or not os.getenv('SF_ORG_ID'):
+            logger.warning("pubsub_unavailable_falling_back_to_cometd")
+            return False
+        return True
+
+    @staticmethod
+    def _extract_polling(event: dict) -> Tuple[Optional[str], Optional[str]]:
+        """Return (record_id, change_type) from a polled record."""
+        return event.get('Id'), event.get('__change_type', 'UPDATE')
+
+    @staticmethod
+    def _extract_cdc(event: dict) -> Tuple[Optional[str], Optional[str]]:
+        """Return (record_id, change_type) from a CDC change event."""
+        header = event.get('ChangeEventHeader') or {}
+        record_ids = header.get('recordIds')
+        return (record_ids[0] if record_ids else None), header.get('changeType')
+
+    @staticmethod
+    def _merge_events(older: dict, newer: dict) -> dict:
+        """
+        Fold a newer change event for the same record into an older one.
+
+        CDC events carry only changed fields (unchanged ones are absent or
+        null), so fields are overlaid rather than replaced, and a CREATE is
+        kept so a burst starting with an insert still triggers routing.
+        """
+        merged = dict(older)
+        merged.update((k, v) for k, v in newer.items() if v is not None)
+
+        older_header = older.get('ChangeEventHeader') or {}
+        if older_header.get('changeType') == 'CREATE':
+            merged['ChangeEventHeader'] = {
+                **(newer.get('ChangeEventHeader') or {}),
+                'changeType': 'CREATE'
+            }
+        return merged
+
+    def _debounced(self, handler: Callable[[dict], Any]) -> Callable[[dict], Any]:
+        """
+        Wrap an event handler so bursts for the same record run it once.
+
+        Args:
+            handler: Async event handler
+
+        Returns:
+            Async handler that defers to handler after DEBOUNCE_SECONDS of quiet
+        """
+        async def on_event(event: dict):
+            record_id, _ = self._extract_ids(event)
+            if not record_id:
+                await handler(event)
+                return
+
+            key = (handler.__name__, record_id)
+            pending = self._pending.get(key)
+            if pending:
+                event = self._merge_events(pending[1], event)
+            self._pending[key] = (handler, event)
+
+            timer = self._timers.get(key)
+            if timer:
+                timer.cancel()
+            self._timers[key] = asyncio.get_running_loop().call_later(
+                self.DEBOUNCE_SECONDS, self._schedule_flush, key
+            )
+
+        return on_event
+
+    def _schedule_flush(self, key: Tuple[str, str]):
+        """Timer callback: run the coalesced event for key."""
+        self._timers.pop(key, None)
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        handler, event = pending
+        task = asyncio.create_task(handler(event))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
     def _register_handlers(self):
         """Register event handlers for CDC/polling."""
         if self.use_polling:
@@ -85,9 +203,11 @@ class FlywheelIntegration:
             self.listener.register_handler('Task', self._handle_task_change)
             self.listener.register_handler('EmailMessage', self._handle_email_change)
         else:
-            self.listener.register_handler('/data/LeadChangeEvent', self._handle_lead_change)
-            self.listener.register_handler('/data/TaskChangeEvent', self._handle_task_change)
-            self.listener.register_handler('/data/EmailMessageChangeEvent', self._handle_email_change)
+            # CDC emits bursts of events per record (e.g. trigger cascades);
+            # polling already returns one row per record per page
+            self.listener.register_handler('/data/LeadChangeEvent', self._debounced(self._handle_lead_change))
+            self.listener.register_handler('/data/TaskChangeEvent', self._debounced(self._handle_task_change))
+            self.listener.register_handler('/data/EmailMessageChangeEvent', self._debounced(self._handle_email_change))
 
         logger.info("event_handlers_registered")
 
@@ -100,16 +220,7 @@ class FlywheelIntegration:
         - Template suggestion (if description indicates inquiry)
         """
         try:
-            # Extract lead ID based on event type
-            if self.use_polling:
-                lead_id = event.get('Id')
-                change_type = event.get('__change_type', 'UPDATE')
-            else:
-                change_event_header = event.get('ChangeEventHeader', {})
-                entity_name = change_event_header.get('entityName')
-                change_type = change_event_header.get('changeType')
-                record_ids = change_event_header.get('recordIds', [])
-                lead_id = record_ids[0] if record_ids else None
+            lead_id, change_type = self._extract_ids(event)
 
             if not lead_id:
                 logger.warning("lead_event_missing_id", event=event)
@@ -117,15 +228,25 @@ class FlywheelIntegration:
 
             logger.info("processing_lead_event", lead_id=lead_id, change_type=change_type)
 
-            # Route new leads
+            # Route new leads and suggest a template; the two workloads are
+            # independent, so run them side by side off the event loop
             if change_type == 'CREATE':
                 logger.info("routing_new_lead", lead_id=lead_id)
-                routing_result = self.lead_router.route_lead(lead_id)
-                logger.info("lead_routed", lead_id=lead_id, result=routing_result)
-
-                # Suggest template for new leads
-                template_result = self.template_suggester.suggest_template(lead_id)
-                logger.info("template_suggested", lead_id=lead_id, template=template_result.get('template_id'))
+                routing_result, template_result = await asyncio.gather(
+                    asyncio.to_thread(self.lead_router.route_lead, lead_id),
+                    asyncio.to_thread(self.template_suggester.suggest_template, lead_id),
+                    return_exceptions=True
+                )
+
+                if isinstance(routing_result, Exception):
+                    logger.error("lead_routing_error", lead_id=lead_id, error=str(routing_result))
+                else:
+                    logger.info("lead_routed", lead_id=lead_id, result=routing_result)
+
+                if isinstance(template_result, Exception):
+                    logger.error("template_suggestion_error", lead_id=lead_id, error=str(template_result))
+                else:
+                    logger.info("template_suggested", lead_id=lead_id, template=template_result.get('template_id'))
 
         except Exception as e:
             logger.error("lead_event_handler_error", error=str(e), event=event)
@@ -138,23 +259,15 @@ class FlywheelIntegration:
         - First touch detection (for completed tasks related to leads)
         """
         try:
-            # Extract task data
-            if self.use_polling:
-                task_id = event.get('Id')
-                who_id = event.get('WhoId')
-                status = event.get('Status')
-            else:
-                change_event_header = event.get('ChangeEventHeader', {})
-                record_ids = change_event_header.get('recordIds', [])
-                task_id = record_ids[0] if record_ids else None
-                who_id = event.get('WhoId')
-                status = event.get('Status')
+            task_id, _ = self._extract_ids(event)
+            who_id = event.get('WhoId')
+            status = event.get('Status')
 
             if not task_id or not who_id:
                 return
 
             # Check if this is a lead-related task
-            if who_id.startswith('00Q'):  # Lead ID prefix
+            if who_id[:3] == _LEAD_PREFIX:
                 logger.info("processing_task_event", task_id=task_id, lead_id=who_id)
 
                 # Detect first touch if task is completed
@@ -174,21 +287,14 @@ class FlywheelIntegration:
         - First touch detection (for emails related to leads)
         """
         try:
-            # Extract email data
-            if self.use_polling:
-                email_id = event.get('Id')
-                related_to_id = event.get('RelatedToId')
-            else:
-                change_event_header = event.get('ChangeEventHeader', {})
-                record_ids = change_event_header.get('recordIds', [])
-                email_id = record_ids[0] if record_ids else None
-                related_to_id = event.get('RelatedToId')
+            email_id, _ = self._extract_ids(event)
+            related_to_id = event.get('RelatedToId')
 
             if not email_id or not related_to_id:
                 return
 
             # Check if this is a lead-related email
-            if related_to_id.startswith('00Q'):  # Lead ID prefix
+            if related_to_id[:3] == _LEAD_PREFIX:
                 logger.info("processing_email_event", email_id=email_id, lead_id=related_to_id)
 
                 # Detect first touch
@@ -222,6 +328,21 @@ class FlywheelIntegration:
             else:
                 self.listener.stop()
 
+        # Handle events still waiting out their debounce window
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        pending, self._pending = self._pending, {}
+        await asyncio.gather(
+            *self._flush_tasks,
+            *(handler(event) for handler, event in pending.values()),
+            return_exceptions=True
+        )
+
+        await self.sf_client.aclose()
+        # Write out any buffered flywheel log entries
+        self.flywheel_logger.close()
+
         logger.info("flywheel_integration_stopped")
 
 
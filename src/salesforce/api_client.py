@@ -4,18 +4,164 @@ Salesforce REST API client.
 Provides methods for common Salesforce operations: queries, updates, email sends.
 """
 
+import asyncio
+import csv
+import importlib.util
+import io
+import json
 import os
-from typing import Any, Dict, List, Optional
+import re
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote_plus
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import structlog
 from src.auth.jwt_auth import SalesforceJWTAuth
 
-logger = structlog.get_logger()
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encode/decode
+    orjson = None
+
+try:
+    import httpx
+except ImportError:  # Optional: async (HTTP/2) transport for aquery
+    httpx = None
+
+# httpx negotiates HTTP/2 only when the h2 package is installed
+_HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+logger = structlog.get_logger().bind(component="sf_api")
+
+# Resolved once so hot-path debug calls cost a single branch when disabled
+_DEBUG_ENABLED = os.getenv('LOG_LEVEL', 'INFO').upper() == 'DEBUG'
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Encode a request body as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode a JSON response body."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# 15- or 18-character Salesforce record ID
+_SALESFORCE_ID_RE = re.compile(r'^[a-zA-Z0-9]{15,18}$')
+
+# Fixed-shape first-response lookups; only the validated record ID varies
+_FIRST_TASK_SOQL = (
+    "SELECT Id, CreatedDate, OwnerId, Owner.Name, Type FROM Task "
+    "WHERE WhoId = '{id}' AND Status = 'Completed' "
+    "AND Type IN ('Call', 'Email', 'Meeting') "
+    "ORDER BY CreatedDate ASC LIMIT 1"
+)
+_FIRST_EMAIL_SOQL = (
+    "SELECT Id, MessageDate, CreatedById, CreatedBy.Name, FromAddress "
+    "FROM EmailMessage WHERE RelatedToId = '{id}' "
+    "ORDER BY MessageDate ASC LIMIT 1"
+)
+
+# Same lookups for many leads at once: child subqueries with LIMIT 1 return
+# exactly one row per lead, so a chunk never pages past the query batch size
+_FIRST_RESPONSES_BULK_SOQL = (
+    "SELECT Id, "
+    "(SELECT Id, CreatedDate, OwnerId, Owner.Name, Type FROM Tasks "
+    "WHERE Status = 'Completed' AND Type IN ('Call', 'Email', 'Meeting') "
+    "ORDER BY CreatedDate ASC LIMIT 1), "
+    "(SELECT Id, MessageDate, CreatedById, CreatedBy.Name, FromAddress FROM Emails "
+    "ORDER BY MessageDate ASC LIMIT 1) "
+    "FROM Lead WHERE Id IN ({ids})"
+)
+
+
+def _escape_soql_id(record_id: str) -> str:
+    """
+    Validate a Salesforce record ID before it is embedded in SOQL.
+
+    Args:
+        record_id: Salesforce record ID
+
+    Returns:
+        The record ID, unchanged
+
+    Raises:
+        ValueError: If record_id is not a 15/18-character alphanumeric ID
+    """
+    if not isinstance(record_id, str) or not _SALESFORCE_ID_RE.match(record_id):
+        raise ValueError(f"Invalid Salesforce record ID: {record_id!r}")
+    return record_id
+
+
+def _pick_first_response(
+    task: Optional[Dict[str, Any]],
+    email: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Choose the earlier of a lead's first completed Task and first EmailMessage.
+
+    Args:
+        task: Earliest qualifying Task record, if any
+        email: Earliest EmailMessage record, if any
+
+    Returns:
+        Dictionary with first response details or None
+    """
+    if task and (not email or task['CreatedDate'] < email['MessageDate']):
+        return {
+            'type': 'Task',
+            'datetime': task['CreatedDate'],
+            'user_id': task['OwnerId'],
+            'user_name': task['Owner']['Name'],
+            'record_id': task['Id']
+        }
+    if email:
+        return {
+            'type': 'EmailMessage',
+            'datetime': email['MessageDate'],
+            'user_id': email['CreatedById'],
+            'user_name': email['CreatedBy']['Name'],
+            'record_id': email['Id']
+        }
+    return None
+
+
+def _first_response_fields(
+    first_response_at: str,
+    first_response_user_id: str,
+    ttfr_minutes: float
+) -> Dict[str, Any]:
+    """Lead fields written when a first response is tracked."""
+    return {
+        'First_Response_At__c': first_response_at,
+        'First_Response_User__c': first_response_user_id,
+        'Time_to_First_Response__c': ttfr_minutes
+    }
 
 
 class SalesforceAPIClient:
     """Client for Salesforce REST API operations."""
 
+    # Maximum subrequests per Composite Batch call
+    COMPOSITE_BATCH_LIMIT = 25
+
+    # Maximum records per sObject Collections (composite/sobjects) call
+    COMPOSITE_SOBJECTS_LIMIT = 200
+
+    # Bulk API 2.0 query job polling
+    BULK_POLL_INTERVAL = 2.0
+    BULK_MAX_WAIT = 600
+
     def __init__(self, auth: SalesforceJWTAuth, api_version: str = "59.0"):
         """
         Initialize Salesforce API client.
@@ -28,12 +174,61 @@ class SalesforceAPIClient:
         self.api_version = api_version
         self.base_url = f"{auth.instance_url}/services/data/v{api_version}"
 
+        # Auth headers cached for the token lifetime; refreshed early or on 401.
+        # The lock serializes refresh when the client is shared across threads.
+        self._auth_lock = threading.Lock()
+        self._cached_headers: Optional[Dict[str, str]] = None
+        self._headers_exp = 0.0
+
+        # Pooled keep-alive session; retries only idempotent methods (urllib3 default)
+        self._http = requests.Session()
+        self._http.mount('https://', HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        ))
+
+        # Async client for event-loop callers; created on first use so it
+        # binds to the running loop
+        self._ahttp = None
+
+    def _get_headers(self, force_refresh: bool = False) -> Dict[str, str]:
+        """
+        Get cached auth headers, refreshing near expiry or when forced.
+
+        Args:
+            force_refresh: Force a new access token (e.g., after a 401)
+
+        Returns:
+            Authorization headers
+        """
+        with self._auth_lock:
+            now = time.time()
+            if force_refresh or self._cached_headers is None or now >= self._headers_exp:
+                if force_refresh:
+                    self.auth.get_access_token(force_refresh=True)
+                self._cached_headers = self.auth.get_auth_headers()
+                # Expire with the token auth just handed out (it already
+                # allows a safety margin), not a full lifetime from now
+                expires_at = self.auth.token_expires_at
+                self._headers_exp = (
+                    expires_at.replace(tzinfo=timezone.utc).timestamp() if expires_at
+                    else now + self.auth.token_expiry_seconds - self.auth.TOKEN_REFRESH_MARGIN
+                )
+            return self._cached_headers
+
     def _make_request(
         self,
         method: str,
         endpoint: str,
         data: Optional[Dict] = None,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        stream: bool = False,
+        headers: Optional[Dict[str, str]] = None
     ) -> requests.Response:
         """
         Make authenticated request to Salesforce API.
@@ -43,24 +238,44 @@ class SalesforceAPIClient:
             endpoint: API endpoint (without base URL)
             data: Request body (for POST/PATCH)
             params: Query parameters
+            stream: Defer downloading the response body (for large results)
+            headers: Extra request headers, merged over the auth headers
 
         Returns:
             Response object
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
-        headers = self.auth.get_auth_headers()
+        # Encoded once and reused by the 401 retry; Content-Type comes from auth headers
+        body = _json_dumps(data) if data is not None else None
 
-        logger.debug("api_request", method=method, url=url)
+        if _DEBUG_ENABLED:
+            logger.debug("api_request", method=method, url=url)
 
         try:
-            response = requests.request(
+            response = self._http.request(
                 method=method,
                 url=url,
-                headers=headers,
-                json=data,
+                headers={**self._get_headers(), **headers} if headers else self._get_headers(),
+                data=body,
                 params=params,
-                timeout=30
+                timeout=(3.05, 30),
+                stream=stream
             )
+
+            # Token revoked or expired server-side: refresh once and retry
+            if response.status_code == 401:
+                logger.warning("api_request_unauthorized_refreshing_token", url=url)
+                refreshed = self._get_headers(force_refresh=True)
+                response = self._http.request(
+                    method=method,
+                    url=url,
+                    headers={**refreshed, **headers} if headers else refreshed,
+                    data=body,
+                    params=params,
+                    timeout=(3.05, 30),
+                    stream=stream
+                )
+
             response.raise_for_status()
             return response
 
@@ -68,6 +283,79 @@ class SalesforceAPIClient:
             logger.error("api_request_failed", error=str(e), url=url)
             raise
 
+    async def _aget_headers(self, force_refresh: bool = False) -> Dict[str, str]:
+        """Async _get_headers: cached headers inline, token refresh in a thread."""
+        if not force_refresh and self._cached_headers is not None and time.time() < self._headers_exp:
+            return self._cached_headers
+        return await asyncio.to_thread(self._get_headers, force_refresh)
+
+    async def _amake_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict] = None,
+        params: Optional[Dict] = None
+    ) -> "httpx.Response":
+        """
+        Make authenticated request to Salesforce API without blocking the loop.
+
+        Uses one pooled httpx.AsyncClient (HTTP/2 when h2 is installed), so
+        concurrent callers multiplex over a single connection.
+
+        Args:
+            method: HTTP method (GET, POST, PATCH, DELETE)
+            endpoint: API endpoint (without base URL)
+            data: Request body (for POST/PATCH)
+            params: Query parameters
+
+        Returns:
+            Response object
+        """
+        if self._ahttp is None:
+            # Transport retries cover connection failures only
+            self._ahttp = httpx.AsyncClient(
+                timeout=httpx.Timeout(30.0, connect=3.05),
+                transport=httpx.AsyncHTTPTransport(
+                    http2=_HTTP2_AVAILABLE,
+                    limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+                    retries=3
+                )
+            )
+
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        body = _json_dumps(data) if data is not None else None
+
+        if _DEBUG_ENABLED:
+            logger.debug("api_request", method=method, url=url)
+
+        try:
+            response = await self._ahttp.request(
+                method, url, headers=await self._aget_headers(), content=body, params=params
+            )
+
+            # Token revoked or expired server-side: refresh once and retry
+            if response.status_code == 401:
+                logger.warning("api_request_unauthorized_refreshing_token", url=url)
+                response = await self._ahttp.request(
+                    method, url,
+                    headers=await self._aget_headers(force_refresh=True),
+                    content=body,
+                    params=params
+                )
+
+            response.raise_for_status()
+            return response
+
+        except httpx.HTTPError as e:
+            logger.error("api_request_failed", error=str(e), url=url)
+            raise
+
+    async def aclose(self):
+        """Close the async HTTP client, if one was opened."""
+        if self._ahttp is not None:
+            await self._ahttp.aclose()
+            self._ahttp = None
+
     def query(self, soql: str) -> List[Dict[str, Any]]:
         """
         Execute SOQL query.
@@ -86,12 +374,169 @@ class SalesforceAPIClient:
             params={'q': soql}
         )
 
-        result = response.json()
+        result = _json_loads(response.content)
         records = result.get('records', [])
 
         logger.info("query_complete", record_count=len(records))
         return records
 
+    async def aquery(self, soql: str) -> List[Dict[str, Any]]:
+        """
+        Execute SOQL query from async code.
+
+        Falls back to running query() in a worker thread when httpx is not
+        installed.
+
+        Args:
+            soql: SOQL query string
+
+        Returns:
+            List of records
+        """
+        if httpx is None:
+            return await asyncio.to_thread(self.query, soql)
+
+        logger.info("executing_soql", query=soql)
+
+        response = await self._amake_request('GET', 'query', params={'q': soql})
+        records = _json_loads(response.content).get('records', [])
+
+        logger.info("query_complete", record_count=len(records))
+        return records
+
+    def query_iter(self, soql: str, batch_size: int = 2000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Execute SOQL query and yield its result one page at a time.
+
+        Follows nextRecordsUrl, so callers can start on the first page while
+        later pages are still on the server, and never hold more than one.
+
+        Args:
+            soql: SOQL query string
+            batch_size: Records per page requested from Salesforce (200-2000;
+                a hint the server may lower)
+
+        Yields:
+            Lists of records
+        """
+        logger.info("executing_soql", query=soql)
+
+        # Page size is set per query cursor; follow-up pages inherit it
+        options = {'Sforce-Query-Options': f'batchSize={batch_size}'}
+        result = _json_loads(self._make_request(
+            'GET', 'query', params={'q': soql}, headers=options
+        ).content)
+
+        record_count = 0
+        while True:
+            records = result.get('records', [])
+            record_count += len(records)
+            yield records
+
+            next_url = result.get('nextRecordsUrl')
+            if result.get('done', True) or not next_url:
+                break
+            # nextRecordsUrl is server-relative (/services/data/vXX.X/query/<locator>)
+            result = _json_loads(self._make_request(
+                'GET', f"query/{next_url.rsplit('/query/', 1)[1]}"
+            ).content)
+
+        logger.info("query_complete", record_count=record_count)
+
+    def batch_query(self, soqls: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Execute several SOQL queries in one Composite Batch round-trip.
+
+        Salesforce accepts up to 25 subrequests per batch; longer lists are
+        split across multiple batch calls.
+
+        Args:
+            soqls: SOQL query strings
+
+        Returns:
+            List of record lists, in the same order as soqls
+        """
+        logger.info("executing_soql_batch", query_count=len(soqls))
+
+        results: List[List[Dict[str, Any]]] = []
+
+        for start in range(0, len(soqls), self.COMPOSITE_BATCH_LIMIT):
+            chunk = soqls[start:start + self.COMPOSITE_BATCH_LIMIT]
+            body = {
+                "batchRequests": [
+                    {"method": "GET", "url": f"v{self.api_version}/query?q={quote_plus(soql)}"}
+                    for soql in chunk
+                ]
+            }
+
+            response = self._make_request('POST', 'composite/batch', data=body)
+
+            for soql, sub in zip(chunk, _json_loads(response.content).get('results', [])):
+                if sub.get('statusCode', 500) >= 400:
+                    logger.error("batch_subquery_failed", query=soql, result=sub.get('result'))
+                    raise requests.exceptions.HTTPError(
+                        f"Composite batch subrequest failed with status {sub.get('statusCode')}"
+                    )
+                results.append(sub['result'].get('records', []))
+
+        logger.info("query_batch_complete", record_counts=[len(r) for r in results])
+        return results
+
+    def bulk_query(self, soql: str) -> Iterator[Dict[str, Any]]:
+        """
+        Execute a SOQL query as a Bulk API 2.0 job and stream the results.
+
+        Suited to large backfills: one async job replaces many paged REST
+        queries and counts far less against API limits. Empty CSV cells are
+        returned as None to match REST query records.
+
+        Args:
+            soql: SOQL query string
+
+        Yields:
+            Record dictionaries (all values are strings or None)
+        """
+        logger.info("executing_bulk_query", query=soql)
+
+        job = _json_loads(self._make_request(
+            'POST', 'jobs/query', data={"operation": "query", "query": soql}
+        ).content)
+        job_id = job['id']
+
+        deadline = time.time() + self.BULK_MAX_WAIT
+        while job.get('state') != 'JobComplete':
+            if job.get('state') in ('Failed', 'Aborted'):
+                logger.error("bulk_query_failed", job_id=job_id, state=job.get('state'),
+                             error=job.get('errorMessage'))
+                raise requests.exceptions.HTTPError(
+                    f"Bulk query job {job_id} {job.get('state')}: {job.get('errorMessage')}"
+                )
+            if time.time() > deadline:
+                raise requests.exceptions.Timeout(f"Bulk query job {job_id} did not complete")
+            time.sleep(self.BULK_POLL_INTERVAL)
+            job = _json_loads(self._make_request('GET', f'jobs/query/{job_id}').content)
+
+        record_count = 0
+        params: Dict[str, str] = {}
+        while True:
+            response = self._make_request(
+                'GET', f'jobs/query/{job_id}/results', params=params, stream=True
+            )
+            # Results may be gzip-compressed on the wire; decode while streaming
+            response.raw.decode_content = True
+            with response:
+                reader = csv.DictReader(io.TextIOWrapper(response.raw, encoding='utf-8', newline=''))
+                for row in reader:
+                    record_count += 1
+                    yield {k: (v if v != '' else None) for k, v in row.items()}
+
+            locator = response.headers.get('Sforce-Locator')
+            if not locator or locator == 'null':
+                break
+            params = {'locator': locator}
+
+        logger.info("bulk_query_complete", job_id=job_id, record_count=record_count)
+
     def get_record(self, sobject_type: str, record_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get a single record by ID.
@@ -111,7 +556,7 @@ class SalesforceAPIClient:
             params['fields'] = ','.join(fields)
 
         response = self._make_request('GET', endpoint, params=params)
-        return response.json()
+        return _json_loads(response.content)
 
     def update_record(self, sobject_type: str, record_id: str, data: Dict[str, Any]) -> bool:
         """
@@ -134,6 +579,42 @@ class SalesforceAPIClient:
         logger.info("record_updated", sobject=sobject_type, id=record_id)
         return True
 
+    def update_records_bulk(
+        self,
+        sobject_type: str,
+        updates: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Update many records via sObject Collections (PATCH composite/sobjects).
+
+        Sends up to 200 records per request with allOrNone disabled, so one
+        bad record does not fail the rest of its chunk.
+
+        Args:
+            sobject_type: SObject type (e.g., 'Lead')
+            updates: Field dicts, each including the record 'Id'
+
+        Returns:
+            Per-record results ({'id', 'success', 'errors'}), in input order
+        """
+        logger.info("updating_records_bulk", sobject=sobject_type, count=len(updates))
+
+        results: List[Dict[str, Any]] = []
+        attributes = {'type': sobject_type}
+
+        for start in range(0, len(updates), self.COMPOSITE_SOBJECTS_LIMIT):
+            chunk = updates[start:start + self.COMPOSITE_SOBJECTS_LIMIT]
+            body = {
+                'allOrNone': False,
+                'records': [{'attributes': attributes, **update} for update in chunk]
+            }
+            response = self._make_request('PATCH', 'composite/sobjects', data=body)
+            results.extend(_json_loads(response.content))
+
+        failed = sum(1 for r in results if not r.get('success'))
+        logger.info("records_updated_bulk", sobject=sobject_type, count=len(results), failed=failed)
+        return results
+
     def create_record(self, sobject_type: str, data: Dict[str, Any]) -> str:
         """
         Create a new record (POST).
@@ -150,7 +631,7 @@ class SalesforceAPIClient:
         logger.info("creating_record", sobject=sobject_type, fields=list(data.keys()))
 
         response = self._make_request('POST', endpoint, data=data)
-        result = response.json()
+        result = _json_loads(response.content)
 
         record_id = result.get('id')
         logger.info("record_created", sobject=sobject_type, id=record_id)
@@ -192,7 +673,7 @@ class SalesforceAPIClient:
         logger.info("sending_email", to=to_addresses, subject=subject)
 
         response = self._make_request('POST', endpoint, data=data)
-        result = response.json()
+        result = _json_loads(response.content)
 
         success = result.get('outputs', [{}])[0].get('success', False)
 
@@ -212,72 +693,61 @@ class SalesforceAPIClient:
 
         Returns:
             Dictionary with first response details or None
+
+        Raises:
+            ValueError: If lead_id is not a valid Salesforce ID
         """
-        # Check for earliest completed Task
-        task_soql = f"""
-            SELECT Id, CreatedDate, OwnerId, Owner.Name, Type
-            FROM Task
-            WHERE WhoId = '{lead_id}'
-            AND Status = 'Completed'
-            AND Type IN ('Call', 'Email', 'Meeting')
-            ORDER BY CreatedDate ASC
-            LIMIT 1
-        """
-
-        tasks = self.query(task_soql)
-
-        # Check for earliest EmailMessage (Enhanced Email)
-        email_soql = f"""
-            SELECT Id, MessageDate, CreatedById, CreatedBy.Name, FromAddress
-            FROM EmailMessage
-            WHERE RelatedToId = '{lead_id}'
-            ORDER BY MessageDate ASC
-            LIMIT 1
-        """
-
-        emails = self.query(email_soql)
-
-        # Determine which came first
-        first_response = None
-
-        if tasks and emails:
-            task_date = tasks[0]['CreatedDate']
-            email_date = emails[0]['MessageDate']
-
-            if task_date < email_date:
-                first_response = {
-                    'type': 'Task',
-                    'datetime': task_date,
-                    'user_id': tasks[0]['OwnerId'],
-                    'user_name': tasks[0]['Owner']['Name'],
-                    'record_id': tasks[0]['Id']
-                }
-            else:
-                first_response = {
-                    'type': 'EmailMessage',
-                    'datetime': email_date,
-                    'user_id': emails[0]['CreatedById'],
-                    'user_name': emails[0]['CreatedBy']['Name'],
-                    'record_id': emails[0]['Id']
-                }
-        elif tasks:
-            first_response = {
-                'type': 'Task',
-                'datetime': tasks[0]['CreatedDate'],
-                'user_id': tasks[0]['OwnerId'],
-                'user_name': tasks[0]['Owner']['Name'],
-                'record_id': tasks[0]['Id']
-            }
-        elif emails:
-            first_response = {
-                'type': 'EmailMessage',
-                'datetime': emails[0]['MessageDate'],
-                'user_id': emails[0]['CreatedById'],
-                'user_name': emails[0]['CreatedBy']['Name'],
-                'record_id': emails[0]['Id']
-            }
+        safe_id = _escape_soql_id(lead_id)
+
+        # Earliest completed Task and earliest EmailMessage (Enhanced Email)
+        task_soql = _FIRST_TASK_SOQL.format(id=safe_id)
+        email_soql = _FIRST_EMAIL_SOQL.format(id=safe_id)
 
-        return first_response
+        # Both lookups share one Composite Batch round-trip
+        tasks, emails = self.batch_query([task_soql, email_soql])
+
+        return _pick_first_response(
+            tasks[0] if tasks else None,
+            emails[0] if emails else None
+        )
+
+    def get_first_responses_bulk(self, lead_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the first response for many Leads in as few round-trips as possible.
+
+        Leads are looked up 200 per SOQL query (one row per lead via child
+        subqueries), and the queries share Composite Batch calls.
+
+        Args:
+            lead_ids: Lead IDs
+
+        Returns:
+            Mapping of lead ID to first response details; leads without a
+            response are omitted
+
+        Raises:
+            ValueError: If any lead ID is not a valid Salesforce ID
+        """
+        soqls = []
+        for start in range(0, len(lead_ids), self.COMPOSITE_SOBJECTS_LIMIT):
+            chunk = lead_ids[start:start + self.COMPOSITE_SOBJECTS_LIMIT]
+            ids = ', '.join(f"'{_escape_soql_id(lead_id)}'" for lead_id in chunk)
+            soqls.append(_FIRST_RESPONSES_BULK_SOQL.format(ids=ids))
+
+        first_responses: Dict[str, Dict[str, Any]] = {}
+        for records in self.batch_query(soqls):
+            for lead in records:
+                tasks = (lead.get('Tasks') or {}).get('records')
+                emails = (lead.get('Emails') or {}).get('records')
+                first_response = _pick_first_response(
+                    tasks[0] if tasks else None,
+                    emails[0] if emails else None
+                )
+                if first_response:
+                    first_responses[lead['Id']] = first_response
+
+        logger.info("first_responses_bulk_complete", leads=len(lead_ids), found=len(first_responses))
+        return first_responses
 
     def update_lead_first_response(
         self,
@@ -301,9 +771,129 @@ class SalesforceAPIClient:
         return self.update_record(
             'Lead',
             lead_id,
+            _first_response_fields(first_response_at, first_response_user_id, ttfr_minutes)
+        )
+
+    def update_leads_first_response_bulk(self, updates: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Update first response tracking fields on many Leads.
+
+        Args:
+            updates: Dicts with lead_id, first_response_at,
+                first_response_user_id and ttfr_minutes
+
+        Returns:
+            Per-record results ({'id', 'success', 'errors'}), in input order
+        """
+        return self.update_records_bulk('Lead', [
             {
-                'First_Response_At__c': first_response_at,
-                'First_Response_User__c': first_response_user_id,
-                'Time_to_First_Response__c': ttfr_minutes
+                'Id': update['lead_id'],
+                **_first_response_fields(
+                    update['first_response_at'],
+                    update['first_response_user_id'],
+                    update['ttfr_minutes']
+                )
             }
-        )
+            for update in updates
+        ])
+
+
+class RecordUpdateBatcher:
+    """
+    Coalesces single-record updates from concurrent callers into
+    sObject Collections calls.
+
+    A caller with no batch already in flight sends its update right away.
+    Updates that arrive while a batch is being sent queue up, and the first
+    of them waits until that send finishes (at most flush_interval, or
+    until the batch is full) before sending everything queued in one
+    request. Every caller blocks until its own record's result is known,
+    so call sites keep the semantics of update_record.
+    """
+
+    def __init__(
+        self,
+        sf_client: SalesforceAPIClient,
+        sobject_type: str,
+        flush_interval: float = 0.2,
+        max_batch: int = SalesforceAPIClient.COMPOSITE_SOBJECTS_LIMIT
+    ):
+        """
+        Initialize update batcher.
+
+        Args:
+            sf_client: Salesforce API client
+            sobject_type: SObject type all updates apply to
+            flush_interval: Longest a queued update waits on an in-flight
+                batch before flushing
+            max_batch: Flush early once this many updates are queued
+        """
+        self.sf_client = sf_client
+        self.sobject_type = sobject_type
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[Dict[str, Any], Future]] = []
+        self._in_flight = 0
+
+    def update(self, record_id: str, data: Dict[str, Any]) -> bool:
+        """
+        Queue an update and wait for the batch it lands in to be sent.
+
+        Args:
+            record_id: Salesforce record ID
+            data: Fields to update
+
+        Returns:
+            True if successful
+
+        Raises:
+            requests.exceptions.RequestException: If the request or the
+                record's update failed
+        """
+        future: Future = Future()
+        with self._cond:
+            self._pending.append(({'Id': record_id, **data}, future))
+            leader = len(self._pending) == 1
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+            if leader:
+                # Only collect while another batch is on the wire; a lone
+                # caller's update goes out immediately
+                self._cond.wait_for(
+                    lambda: not self._in_flight or len(self._pending) >= self.max_batch,
+                    timeout=self.flush_interval
+                )
+                batch, self._pending = self._pending, []
+                self._in_flight += 1
+
+        if leader:
+            try:
+                self._flush(batch)
+            finally:
+                with self._cond:
+                    self._in_flight -= 1
+                    self._cond.notify_all()
+
+        return future.result()
+
+    def _flush(self, batch: List[Tuple[Dict[str, Any], Future]]):
+        """Send one batch and resolve each caller's future."""
+        try:
+            results = self.sf_client.update_records_bulk(
+                self.sobject_type, [update for update, _ in batch]
+            )
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        for (update, future), result in zip(batch, results):
+            if result.get('success'):
+                future.set_result(True)
+            else:
+                future.set_exception(requests.exceptions.HTTPError(
+                    f"Update of {update['Id']} failed: {result.get('errors')}"
+                ))
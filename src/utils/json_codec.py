@@ -0,0 +1,47 @@
+"""
+JSON helpers for workloads.
+
+Uses orjson when it is installed and falls back to the stdlib json module.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # Optional: faster JSON encode/decode
+    orjson = None
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Decode a JSON document.
+
+    Args:
+        data: JSON text
+
+    Returns:
+        Decoded object
+
+    Raises:
+        json.JSONDecodeError: If data is not valid JSON (orjson's error
+            subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_pretty(obj: Any) -> str:
+    """
+    Encode an object as JSON indented by two spaces, for CLI output.
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        Indented JSON text
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2)
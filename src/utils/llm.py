@@ -0,0 +1,29 @@
+"""
+Shared LLM client.
+
+One Anthropic client per process, so workloads reuse its connection pool
+instead of each building their own.
+"""
+
+import os
+import threading
+from typing import Optional
+from anthropic import Anthropic
+
+_ANTHROPIC: Optional[Anthropic] = None
+_ANTHROPIC_LOCK = threading.Lock()
+
+
+def get_anthropic() -> Anthropic:
+    """
+    Get the process-wide Anthropic client, creating it on first use.
+
+    Returns:
+        Shared Anthropic client
+    """
+    global _ANTHROPIC
+    if _ANTHROPIC is None:
+        with _ANTHROPIC_LOCK:
+            if _ANTHROPIC is None:
+                _ANTHROPIC = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+    return _ANTHROPIC
@@ -4,20 +4,74 @@ First touch detection workload.
 Detects first response to a lead and calculates time-to-first-response (TTFR).
 """
 
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+import numpy as np
 import structlog
-from dateutil import parser as date_parser
 from src.salesforce.api_client import SalesforceAPIClient
 from src.flywheel.logger import FlywheelLogger
+from src.utils.json_codec import json_dumps_pretty
 
 logger = structlog.get_logger()
 
 
+def _parse_sf_datetime(value: str) -> datetime:
+    """
+    Parse a Salesforce ISO-8601 timestamp (e.g. 2024-01-15T10:30:00.000+0000).
+
+    Salesforce emits a fixed format, so the C-implemented fromisoformat is
+    enough. Python 3.11+ parses it as-is; older Pythons reject Z and +HHMM,
+    so on failure the offset is normalized to +HH:MM and parsed again.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    elif value[-5] in '+-' and value[-3] != ':':
+        value = value[:-2] + ':' + value[-2:]
+    return datetime.fromisoformat(value)
+
+
+def _ttfr_minutes_bulk(created: List[str], responded: List[str]) -> List[float]:
+    """
+    Compute time-to-first-response for many leads in one vectorized pass.
+
+    Salesforce returns UTC timestamps (2024-01-15T10:30:00.000+0000), so the
+    offset is dropped and NumPy parses and subtracts the rest in C. Anything
+    not in UTC goes through _parse_sf_datetime instead.
+
+    Args:
+        created: Lead CreatedDate values
+        responded: First response timestamps, aligned with created
+
+    Returns:
+        TTFR in minutes for each pair
+    """
+    if not all(value.endswith(('+0000', 'Z')) for value in created + responded):
+        return [
+            (_parse_sf_datetime(r) - _parse_sf_datetime(c)).total_seconds() / 60
+            for c, r in zip(created, responded)
+        ]
+
+    def naive(value: str) -> str:
+        return value[:-1] if value.endswith('Z') else value[:-5]
+
+    created_at = np.array([naive(value) for value in created], dtype='datetime64[ms]')
+    responded_at = np.array([naive(value) for value in responded], dtype='datetime64[ms]')
+    ttfr_ms = (responded_at - created_at).astype(np.float64)
+    return (ttfr_ms / 60000).tolist()
+
+
 class FirstTouchDetector:
     """Detects and tracks first responses to leads."""
 
+    # Leads per bulk lookup/update during backfill (sObject Collections limit)
+    BACKFILL_CHUNK_SIZE = 200
+
     def __init__(
         self,
         sf_client: SalesforceAPIClient,
@@ -43,7 +97,7 @@ class FirstTouchDetector:
         Returns:
             First touch details or None if already tracked or not found
         """
-        logger.info("detecting_first_touch", lead_id=lead_id)
+        logger.debug("detecting_first_touch", lead_id=lead_id)
 
         # Check if lead already has first response tracked
         lead = self.sf_client.get_record(
@@ -64,13 +118,14 @@ class FirstTouchDetector:
             return None
 
         # Calculate TTFR
-        lead_created = date_parser.parse(lead["CreatedDate"])
-        first_response_at = date_parser.parse(first_response["datetime"])
+        lead_created = _parse_sf_datetime(lead["CreatedDate"])
+        first_response_at = _parse_sf_datetime(first_response["datetime"])
 
         ttfr_delta = first_response_at - lead_created
         ttfr_minutes = ttfr_delta.total_seconds() / 60
 
-        logger.info(
+        # first_touch_tracked below repeats this at INFO once the update lands
+        logger.debug(
             "first_touch_detected",
             lead_id=lead_id,
             ttfr_minutes=ttfr_minutes,
@@ -103,7 +158,12 @@ class FirstTouchDetector:
                 ttfr_minutes=ttfr_minutes
             )
 
-            logger.info("first_touch_tracked", lead_id=lead_id, ttfr_minutes=ttfr_minutes)
+            logger.info(
+                "first_touch_tracked",
+                lead_id=lead_id,
+                ttfr_minutes=ttfr_minutes,
+                response_type=first_response["type"]
+            )
 
             return result
 
@@ -136,29 +196,106 @@ class FirstTouchDetector:
             AND IsConverted = false
         """
 
-        leads = self.sf_client.query(soql)
-
         results = {
-            "total_leads": len(leads),
+            "total_leads": 0,
             "tracked": 0,
             "no_response": 0,
             "errors": 0
         }
 
-        for lead in leads:
-            result = self.detect_first_touch(lead["Id"])
+        # Chunks are independent and I/O-bound; overlap their round-trips,
+        # and start on the first query page while later pages download.
+        # The API client's pooled session is shared across worker threads.
+        max_workers = int(os.getenv("BACKFILL_WORKERS", "16"))
 
-            if result is None:
-                results["no_response"] += 1
-            elif result.get("status") == "tracked":
-                results["tracked"] += 1
-            else:
-                results["errors"] += 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for leads in self.sf_client.query_iter(soql):
+                results["total_leads"] += len(leads)
+                for start in range(0, len(leads), self.BACKFILL_CHUNK_SIZE):
+                    chunk = leads[start:start + self.BACKFILL_CHUNK_SIZE]
+                    futures.append(executor.submit(self._backfill_chunk, chunk))
+
+            for future in as_completed(futures):
+                for key, count in future.result().items():
+                    results[key] += count
 
         logger.info("first_touch_backfill_complete", results=results)
 
         return results
 
+    def _backfill_chunk(self, leads: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Track first touches for one chunk of leads with bulk calls.
+
+        One batched lookup finds every lead's first response and one
+        sObject Collections PATCH writes the tracking fields, instead of
+        three REST calls per lead.
+
+        Args:
+            leads: Lead records with Id and CreatedDate
+
+        Returns:
+            Counts of tracked, no_response and errors for the chunk
+        """
+        counts = {"tracked": 0, "no_response": 0, "errors": 0}
+
+        try:
+            first_responses = self.sf_client.get_first_responses_bulk([lead["Id"] for lead in leads])
+        except Exception as e:
+            logger.error("first_touch_backfill_lookup_failed", count=len(leads), error=str(e))
+            counts["errors"] = len(leads)
+            return counts
+
+        responded = []
+        for lead in leads:
+            first_response = first_responses.get(lead["Id"])
+            if not first_response:
+                counts["no_response"] += 1
+                continue
+            responded.append((lead, first_response))
+
+        ttfr = _ttfr_minutes_bulk(
+            [lead["CreatedDate"] for lead, _ in responded],
+            [first_response["datetime"] for _, first_response in responded]
+        )
+        tracked = [
+            (lead["Id"], first_response, ttfr_minutes)
+            for (lead, first_response), ttfr_minutes in zip(responded, ttfr)
+        ]
+
+        if not tracked:
+            return counts
+
+        try:
+            outcomes = self.sf_client.update_leads_first_response_bulk([
+                {
+                    "lead_id": lead_id,
+                    "first_response_at": first_response["datetime"],
+                    "first_response_user_id": first_response["user_id"],
+                    "ttfr_minutes": ttfr_minutes
+                }
+                for lead_id, first_response, ttfr_minutes in tracked
+            ])
+        except Exception as e:
+            logger.error("first_touch_backfill_update_failed", count=len(tracked), error=str(e))
+            counts["errors"] += len(tracked)
+            return counts
+
+        for (lead_id, first_response, ttfr_minutes), outcome in zip(tracked, outcomes):
+            if outcome.get("success"):
+                counts["tracked"] += 1
+                self.flywheel_logger.log_first_touch_detect(
+                    lead_id=lead_id,
+                    first_response_data=first_response,
+                    ttfr_minutes=ttfr_minutes
+                )
+            else:
+                counts["errors"] += 1
+                logger.error("first_touch_tracking_failed", lead_id=lead_id, error=str(outcome.get("errors")))
+
+        return counts
+
 
 def detect_first_touch_from_event(lead_id: str) -> Optional[Dict[str, Any]]:
     """
@@ -200,12 +337,12 @@ if __name__ == "__main__":
 
             detector = FirstTouchDetector(sf_client, flywheel_logger)
             result = detector.backfill_missing_first_touches(days)
-            print(json.dumps(result, indent=2))
+            print(json_dumps_pretty(result))
         else:
             lead_id = sys.argv[1]
             result = detect_first_touch_from_event(lead_id)
             if result:
-                print(json.dumps(result, indent=2))
+                print(json_dumps_pretty(result))
             else:
                 print("No first touch detected or already tracked")
     else:
@@ -5,20 +5,58 @@ Automatically assigns new leads to the right owner/queue based on segment,
 region, and product interest using LLM-based decision making.
 """
 
-import json
+import bisect
+import math
 import os
-from typing import Any, Dict
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
 import structlog
-from anthropic import Anthropic
-from src.salesforce.api_client import SalesforceAPIClient
+from src.salesforce.api_client import RecordUpdateBatcher, SalesforceAPIClient
 from src.flywheel.logger import FlywheelLogger
+from src.utils.json_codec import json_dumps_pretty, json_loads
+from src.utils.llm import get_anthropic
 
 logger = structlog.get_logger()
 
+# JSON object inside a ```json (or bare ```) fence in an LLM reply
+_JSON_BLOCK = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+@lru_cache(maxsize=8)
+def _load_policy_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """
+    Load and parse a routing policy file, shared across router instances.
+
+    Args:
+        path: Path to routing policy JSON
+        mtime: File modification time (part of the cache key so edits reload)
+
+    Returns:
+        Parsed policy (shared; treat as read-only)
+    """
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+
+def _magnitude_band(value: Optional[float]) -> int:
+    """Order-of-magnitude bucket (log10) so near-identical amounts share a key."""
+    if not value or value <= 0:
+        return 0
+    return int(math.log10(value))
+
 
 class LeadRouter:
     """Routes leads to appropriate owners based on lead attributes."""
 
+    # LLM routing decisions kept per feature signature
+    DECISION_CACHE_SIZE = 4096
+
+    # Employee counts within this fraction of a segment boundary go to the LLM
+    SEGMENT_EDGE_MARGIN = 0.1
+
     def __init__(
         self,
         sf_client: SalesforceAPIClient,
@@ -35,22 +73,57 @@ class LeadRouter:
         """
         self.sf_client = sf_client
         self.flywheel_logger = flywheel_logger
-        self.anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.anthropic = get_anthropic()
+
+        # LRU of LLM decisions keyed by banded lead features; leads cluster
+        # in a small feature space, so most repeat an earlier decision
+        self._decision_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._decision_cache_lock = threading.Lock()
+
+        # Owner assignments from concurrent routings share composite calls
+        self._owner_updates = RecordUpdateBatcher(sf_client, "Lead")
 
         # Load routing policy
         self.routing_policy = self._load_routing_policy(routing_policy_path)
+        self._index_policy()
 
     def _load_routing_policy(self, policy_path: str) -> Dict[str, Any]:
         """Load routing policy from JSON file."""
         try:
-            with open(policy_path, 'r') as f:
-                policy = json.load(f)
+            policy = _load_policy_cached(policy_path, os.path.getmtime(policy_path))
             logger.info("routing_policy_loaded", path=policy_path)
             return policy
         except FileNotFoundError:
             logger.warning("routing_policy_not_found", path=policy_path)
             return self._get_default_policy()
 
+    def _index_policy(self):
+        """Precompute O(1) region and bisectable segment lookups from the policy."""
+        # First region listing a country wins, matching the policy's order
+        self._country_to_region: Dict[str, str] = {}
+        for region, countries in self.routing_policy["regions"].items():
+            for country in countries:
+                self._country_to_region.setdefault(country, region)
+
+        # (min_employees, max_employees, segment) sorted by lower bound
+        bands = sorted(
+            (config["employee_range"][0], config["employee_range"][1], segment)
+            for segment, config in self.routing_policy["segments"].items()
+        )
+        self._segment_mins = [band[0] for band in bands]
+        self._segment_bands = [
+            (band[1] if band[1] is not None else float("inf"), band[2]) for band in bands
+        ]
+
+        # (segment, region) -> owner for every way an owner key
+        # "<segment>_<region>" can split, so lookups need no string building
+        self._owner_by_pair: Dict[Tuple[str, str], str] = {}
+        for key, owner_id in self.routing_policy["owners"].items():
+            for i, char in enumerate(key):
+                if char == "_":
+                    self._owner_by_pair[(key[:i], key[i + 1:])] = owner_id
+        self._default_queue = self.routing_policy["queues"]["default"]
+
     def _get_default_policy(self) -> Dict[str, Any]:
         """Get default routing policy."""
         return {
@@ -103,21 +176,49 @@ class LeadRouter:
 
     def _determine_segment(self, employee_count: int) -> str:
         """Determine segment based on employee count."""
-        for segment, config in self.routing_policy["segments"].items():
-            min_emp, max_emp = config["employee_range"]
-            if max_emp is None:
-                if employee_count >= min_emp:
-                    return segment
-            elif min_emp <= employee_count <= max_emp:
+        i = bisect.bisect_right(self._segment_mins, employee_count) - 1
+        if i >= 0:
+            max_emp, segment = self._segment_bands[i]
+            if employee_count <= max_emp:
                 return segment
         return "SMB"  # Default
 
     def _determine_region(self, country: str) -> str:
         """Determine region based on country."""
-        for region, countries in self.routing_policy["regions"].items():
-            if country in countries:
-                return region
-        return "NA"  # Default
+        return self._country_to_region.get(country, "NA")  # Default NA
+
+    def _is_unambiguous(self, features: Dict[str, Any]) -> bool:
+        """
+        Check whether the rule-based routing needs no LLM review.
+
+        A lead is clear-cut when its country is listed in the policy, its
+        employee count sits inside a segment band away from the edges, and
+        it names a product interest.
+
+        Args:
+            features: Lead features
+
+        Returns:
+            True if the rule-based segment and region can be used as-is
+        """
+        if features["country"] not in self._country_to_region:
+            return False
+        if features["product_interest"] in (None, "", "Unknown"):
+            return False
+
+        employee_count = features["employee_count"]
+        if not isinstance(employee_count, (int, float)) or employee_count <= 0:
+            return False
+        i = bisect.bisect_right(self._segment_mins, employee_count) - 1
+        if i < 0:
+            return False
+        min_emp = self._segment_mins[i]
+        max_emp = self._segment_bands[i][0]
+        margin = self.SEGMENT_EDGE_MARGIN
+        return (
+            (i == 0 or employee_count >= min_emp * (1 + margin))
+            and employee_count <= max_emp * (1 - margin)
+        )
 
     def route_lead(self, lead_id: str) -> Dict[str, Any]:
         """
@@ -139,21 +240,30 @@ class LeadRouter:
         segment = self._determine_segment(features["employee_count"])
         region = self._determine_region(features["country"])
 
-        # Use LLM for complex cases or validation
-        routing_decision = self._llm_route_decision(features, segment, region)
+        # Clear-cut leads take the rule-based answer; the LLM handles the rest
+        if self._is_unambiguous(features):
+            routing_decision = {
+                "segment": segment,
+                "region": region,
+                "reason": "rule-based",
+                "confidence": 1.0
+            }
+            model_used = "rule-based"
+        else:
+            routing_decision = self._llm_route_decision(features, segment, region)
+            model_used = "claude-3-sonnet"
 
         # Get owner ID from policy
-        owner_key = f"{routing_decision['segment']}_{routing_decision['region']}"
-        owner_id = self.routing_policy["owners"].get(
-            owner_key,
-            self.routing_policy["queues"]["default"]
+        owner_id = self._owner_by_pair.get(
+            (routing_decision['segment'], routing_decision['region']),
+            self._default_queue
         )
 
         routing_decision["owner"] = owner_id
 
         # Update lead in Salesforce
         try:
-            self.sf_client.update_record("Lead", lead_id, {"OwnerId": owner_id})
+            self._owner_updates.update(lead_id, {"OwnerId": owner_id})
             routing_decision["status"] = "assigned"
             logger.info("lead_assigned", lead_id=lead_id, owner=owner_id)
         except Exception as e:
@@ -166,7 +276,7 @@ class LeadRouter:
             lead_id=lead_id,
             lead_data=features,
             routing_decision=routing_decision,
-            model_used="claude-3-sonnet"
+            model_used=model_used
         )
 
         return routing_decision
@@ -188,6 +298,24 @@ class LeadRouter:
         Returns:
             Routing decision with reasoning
         """
+        key = (
+            suggested_segment,
+            suggested_region,
+            features['country'],
+            features['product_interest'],
+            features['industry'],
+            _magnitude_band(features['annual_revenue']),
+            features['lead_source'],
+        )
+        with self._decision_cache_lock:
+            cached = self._decision_cache.get(key)
+            if cached is not None:
+                self._decision_cache.move_to_end(key)
+        if cached is not None:
+            logger.info("llm_routing_cache_hit", decision=cached)
+            # Callers annotate the decision (owner, status); hand out a copy
+            return dict(cached)
+
         prompt = f"""You are a lead routing expert. Based on the lead information below, determine the best segment and region assignment.
 
 Lead Information:
@@ -221,16 +349,19 @@ Return your decision in JSON format:
             content = response.content[0].text
 
             # Extract JSON from response
-            if "```json" in content:
-                json_str = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                json_str = content.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = content.strip()
+            match = _JSON_BLOCK.search(content)
+            json_str = match.group(1) if match else content.strip()
 
-            decision = json.loads(json_str)
+            decision = json_loads(json_str)
 
             logger.info("llm_routing_decision", decision=decision)
+
+            # Only real LLM answers are cached; fallbacks below are not
+            with self._decision_cache_lock:
+                self._decision_cache[key] = dict(decision)
+                if len(self._decision_cache) > self.DECISION_CACHE_SIZE:
+                    self._decision_cache.popitem(last=False)
+
             return decision
 
         except Exception as e:
@@ -275,6 +406,6 @@ if __name__ == "__main__":
     if len(sys.argv) > 1:
         lead_id = sys.argv[1]
         result = route_lead_from_event(lead_id)
-        print(json.dumps(result, indent=2))
+        print(json_dumps_pretty(result))
     else:
         print("Usage: python lead_route.py <lead_id>")
@@ -4,20 +4,70 @@ Outreach template suggestion workload.
 Recommends personalized email templates based on inbound inquiry context.
 """
 
-import json
+import asyncio
+import hashlib
 import os
-from typing import Any, Dict, List, Optional
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import structlog
-from anthropic import Anthropic
+from anthropic import AsyncAnthropic
 from src.salesforce.api_client import SalesforceAPIClient
 from src.flywheel.logger import FlywheelLogger
+from src.utils.json_codec import json_dumps_pretty, json_loads
+from src.utils.llm import get_anthropic
 
 logger = structlog.get_logger()
 
+# JSON object inside a ```json (or bare ```) fence in an LLM reply
+_JSON_BLOCK = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+
+# {{variable}} placeholder in template subject/body
+_VAR_PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+@lru_cache(maxsize=8)
+def _load_templates_cached(path: str, mtime: float) -> List[Dict[str, Any]]:
+    """
+    Load and parse a templates file, shared across suggester instances.
+
+    Args:
+        path: Path to templates JSON
+        mtime: File modification time (part of the cache key so edits reload)
+
+    Returns:
+        Parsed templates (shared; treat as read-only)
+    """
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+
+def _tokenize_template(text: str) -> List[str]:
+    """Split template text into alternating literal / variable-name tokens."""
+    return _VAR_PLACEHOLDER.split(text)
+
+
+def _render_tokens(tokens: List[str], variables: Dict[str, Any]) -> str:
+    """Fill tokenized template text in one pass; unknown variables stay as-is."""
+    return "".join(
+        token if i % 2 == 0
+        else str(variables[token]) if token in variables
+        else f"{{{{{token}}}}}"
+        for i, token in enumerate(tokens)
+    )
+
 
 class TemplateSuggester:
     """Suggests email templates for lead outreach."""
 
+    # LLM suggestions kept per inquiry content and lead bucket
+    SUGGESTION_CACHE_SIZE = 2048
+
+    # LLM requests in flight at once in suggest_template_batch
+    BATCH_CONCURRENCY = 8
+
     def __init__(
         self,
         sf_client: SalesforceAPIClient,
@@ -34,16 +84,30 @@ class TemplateSuggester:
         """
         self.sf_client = sf_client
         self.flywheel_logger = flywheel_logger
-        self.anthropic = Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
+        self.anthropic = get_anthropic()
 
-        # Load templates
-        self.templates = self._load_templates(templates_path)
+        # LRU of LLM suggestions keyed by inquiry content hash; canned forms
+        # and common questions repeat the same inquiry text
+        self._suggestion_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._suggestion_cache_lock = threading.Lock()
+
+        # Load templates and pre-split them for single-pass filling (copies,
+        # since the parsed file is shared across instances)
+        self.templates = [
+            {
+                **template,
+                "_subject_tokens": _tokenize_template(template["subject"]),
+                "_body_tokens": _tokenize_template(template["body"]),
+            }
+            for template in self._load_templates(templates_path)
+        ]
+        # First template wins on duplicate ids, as with the old linear scan
+        self._template_by_id = {t["id"]: t for t in reversed(self.templates)}
 
     def _load_templates(self, templates_path: str) -> List[Dict[str, Any]]:
         """Load email templates from JSON file."""
         try:
-            with open(templates_path, 'r') as f:
-                templates = json.load(f)
+            templates = _load_templates_cached(templates_path, os.path.getmtime(templates_path))
             logger.info("templates_loaded", path=templates_path, count=len(templates))
             return templates
         except FileNotFoundError:
@@ -154,8 +218,74 @@ Best,
         """
         logger.info("suggesting_template", lead_id=lead_id)
 
-        # Get lead data
-        lead = self.sf_client.get_record(
+        lead = self._get_lead(lead_id)
+
+        inquiry_text = self._inquiry_text(lead, inquiry_text)
+
+        # Get template suggestion from LLM
+        suggestion = self._llm_template_suggestion(lead, inquiry_text)
+
+        return self._complete_suggestion(lead_id, lead, inquiry_text, suggestion, send_email)
+
+    async def suggest_template_batch(
+        self,
+        lead_ids: List[str],
+        send_email: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Suggest email templates for many leads with concurrent LLM calls.
+
+        Each lead's Description is its inquiry text. One AsyncAnthropic
+        client (one connection pool) serves the batch, with at most
+        BATCH_CONCURRENCY requests in flight.
+
+        Args:
+            lead_ids: Salesforce Lead IDs
+            send_email: Whether to send email via Salesforce API
+
+        Returns:
+            Template suggestions in lead_ids order; a lead that fails gets
+            {"lead_id", "status": "failed", "error"} instead
+        """
+        logger.info("suggesting_template_batch", count=len(lead_ids))
+        semaphore = asyncio.Semaphore(self.BATCH_CONCURRENCY)
+
+        async with AsyncAnthropic(api_key=os.getenv('ANTHROPIC_API_KEY')) as client:
+            async def suggest(lead_id: str) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        lead = await asyncio.to_thread(self._get_lead, lead_id)
+                        inquiry_text = self._inquiry_text(lead)
+
+                        key = self._suggestion_key(lead, inquiry_text)
+                        suggestion = self._cached_suggestion(key)
+                        if suggestion is None:
+                            try:
+                                response = await client.messages.create(
+                                    model="claude-3-5-sonnet-20241022",
+                                    max_tokens=1000,
+                                    messages=[{"role": "user", "content": self._suggestion_prompt(lead, inquiry_text)}]
+                                )
+                                suggestion = self._parse_suggestion(key, response.content[0].text)
+                            except Exception as e:
+                                logger.error("template_suggestion_failed", lead_id=lead_id, error=str(e))
+                                suggestion = self._fallback_suggestion()
+
+                        return await asyncio.to_thread(
+                            self._complete_suggestion, lead_id, lead, inquiry_text, suggestion, send_email
+                        )
+                    except Exception as e:
+                        logger.error("template_suggestion_batch_item_failed", lead_id=lead_id, error=str(e))
+                        return {"lead_id": lead_id, "status": "failed", "error": str(e)}
+
+            results = await asyncio.gather(*(suggest(lead_id) for lead_id in lead_ids))
+
+        logger.info("template_suggestion_batch_complete", count=len(results))
+        return list(results)
+
+    def _get_lead(self, lead_id: str) -> Dict[str, Any]:
+        """Fetch the lead fields used for template suggestion and filling."""
+        return self.sf_client.get_record(
             "Lead",
             lead_id,
             fields=[
@@ -165,13 +295,33 @@ Best,
             ]
         )
 
-        # Use inquiry text or lead description
-        if not inquiry_text:
-            inquiry_text = lead.get("Description", "General inquiry")
+    @staticmethod
+    def _inquiry_text(lead: Dict[str, Any], inquiry_text: Optional[str] = None) -> str:
+        """Inquiry text to suggest from: given text, else Description, else a general inquiry."""
+        # Salesforce sends Description: null when it is empty
+        return inquiry_text or lead.get("Description") or "General inquiry"
 
-        # Get template suggestion from LLM
-        suggestion = self._llm_template_suggestion(lead, inquiry_text)
+    def _complete_suggestion(
+        self,
+        lead_id: str,
+        lead: Dict[str, Any],
+        inquiry_text: str,
+        suggestion: Dict[str, Any],
+        send_email: bool
+    ) -> Dict[str, Any]:
+        """
+        Fill the suggested template, optionally send it, and log to flywheel.
 
+        Args:
+            lead_id: Salesforce Lead ID
+            lead: Lead record data
+            inquiry_text: Inbound inquiry text
+            suggestion: Template suggestion from LLM
+            send_email: Whether to send email via Salesforce API
+
+        Returns:
+            Filled template
+        """
         # Fill template variables
         filled_template = self._fill_template_variables(suggestion, lead)
 
@@ -215,13 +365,52 @@ Best,
         Returns:
             Template suggestion with reasoning
         """
+        key = self._suggestion_key(lead, inquiry_text)
+        cached = self._cached_suggestion(key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self.anthropic.messages.create(
+                model="claude-3-5-sonnet-20241022",
+                max_tokens=1000,
+                messages=[{"role": "user", "content": self._suggestion_prompt(lead, inquiry_text)}]
+            )
+            return self._parse_suggestion(key, response.content[0].text)
+
+        except Exception as e:
+            logger.error("template_suggestion_failed", error=str(e))
+            return self._fallback_suggestion()
+
+    @staticmethod
+    def _suggestion_key(lead: Dict[str, Any], inquiry_text: str) -> Tuple:
+        """Cache key: inquiry content hash plus the lead's industry/product bucket."""
+        return (
+            hashlib.blake2b(inquiry_text.encode('utf-8'), digest_size=16).digest(),
+            lead.get('Industry'),
+            lead.get('Product_Interest__c'),
+        )
+
+    def _cached_suggestion(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of a cached suggestion, or None on a miss."""
+        with self._suggestion_cache_lock:
+            cached = self._suggestion_cache.get(key)
+            if cached is not None:
+                self._suggestion_cache.move_to_end(key)
+        if cached is None:
+            return None
+        logger.info("template_suggestion_cache_hit", template_id=cached["template_id"])
+        return dict(cached)
+
+    def _suggestion_prompt(self, lead: Dict[str, Any], inquiry_text: str) -> str:
+        """Build the template-selection prompt for a lead and inquiry."""
         # Build template options description
         template_options = "\n".join([
             f"{i+1}. {t['name']} (ID: {t['id']}) - For {t['intent']} inquiries"
             for i, t in enumerate(self.templates)
         ])
 
-        prompt = f"""You are an expert sales outreach specialist. Based on the inbound inquiry and lead information, recommend the best email template and personalization.
+        return f"""You are an expert sales outreach specialist. Based on the inbound inquiry and lead information, recommend the best email template and personalization.
 
 Lead Information:
 - Name: {lead.get('FirstName', '')} {lead.get('LastName', '')}
@@ -253,39 +442,48 @@ Return your recommendation in JSON format:
   }}
 }}"""
 
-        try:
-            response = self.anthropic.messages.create(
-                model="claude-3-5-sonnet-20241022",
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
-            )
+    def _parse_suggestion(self, key: Tuple, content: str) -> Dict[str, Any]:
+        """
+        Parse an LLM reply into a suggestion and cache it.
+
+        Args:
+            key: Cache key from _suggestion_key
+            content: LLM reply text
 
-            content = response.content[0].text
+        Returns:
+            Template suggestion
 
-            # Extract JSON
-            if "```json" in content:
-                json_str = content.split("```json")[1].split("```")[0].strip()
-            elif "```" in content:
-                json_str = content.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = content.strip()
+        Raises:
+            json.JSONDecodeError: If the reply holds no valid JSON
+            KeyError: If the JSON has no template_id
+        """
+        # Extract JSON
+        match = _JSON_BLOCK.search(content)
+        json_str = match.group(1) if match else content.strip()
 
-            suggestion = json.loads(json_str)
+        suggestion = json_loads(json_str)
 
-            logger.info("template_suggestion_generated", template_id=suggestion["template_id"])
-            return suggestion
+        logger.info("template_suggestion_generated", template_id=suggestion["template_id"])
 
-        except Exception as e:
-            logger.error("template_suggestion_failed", error=str(e))
-            # Fallback to general inquiry template
-            return {
-                "template_id": "general_inquiry",
-                "reason": "Fallback to default template",
-                "intent_detected": "general",
-                "confidence": 0.3,
-                "personalization": {"key_points": [], "tone": "professional", "urgency": "medium"},
-                "variable_suggestions": {}
-            }
+        # Only real LLM answers are cached; the fallback is not
+        with self._suggestion_cache_lock:
+            self._suggestion_cache[key] = dict(suggestion)
+            if len(self._suggestion_cache) > self.SUGGESTION_CACHE_SIZE:
+                self._suggestion_cache.popitem(last=False)
+
+        return suggestion
+
+    @staticmethod
+    def _fallback_suggestion() -> Dict[str, Any]:
+        """Default to the general inquiry template when the LLM call fails."""
+        return {
+            "template_id": "general_inquiry",
+            "reason": "Fallback to default template",
+            "intent_detected": "general",
+            "confidence": 0.3,
+            "personalization": {"key_points": [], "tone": "professional", "urgency": "medium"},
+            "variable_suggestions": {}
+        }
 
     def _fill_template_variables(
         self,
@@ -303,8 +501,8 @@ Return your recommendation in JSON format:
             Filled template with subject and body
         """
         # Find template
-        template = next(
-            (t for t in self.templates if t["id"] == suggestion["template_id"]),
+        template = self._template_by_id.get(
+            suggestion["template_id"],
             self.templates[0]  # Fallback to first template
         )
 
@@ -323,15 +521,9 @@ Return your recommendation in JSON format:
         # Add LLM suggestions
         variables.update(suggestion.get("variable_suggestions", {}))
 
-        # Fill subject
-        subject = template["subject"]
-        for key, value in variables.items():
-            subject = subject.replace(f"{{{{{key}}}}}", str(value))
-
-        # Fill body
-        body = template["body"]
-        for key, value in variables.items():
-            body = body.replace(f"{{{{{key}}}}}", str(value))
+        # Fill subject and body
+        subject = _render_tokens(template["_subject_tokens"], variables)
+        body = _render_tokens(template["_body_tokens"], variables)
 
         return {
             "template_id": template["id"],
@@ -380,6 +572,6 @@ if __name__ == "__main__":
         send = "--send" in sys.argv
 
         suggester = suggest_template_from_event(lead_id, inquiry)
-        print(json.dumps(suggester, indent=2))
+        print(json_dumps_pretty(suggester))
     else:
         print("Usage: python template_suggest.py <lead_id> [inquiry_text] [--send]")
@@ -0,0 +1,32 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from src.auth.jwt_auth import SalesforceJWTAuth
+
+
+@pytest.fixture(scope="session")
+def mock_private_key(tmp_path_factory):
+    """Create a throwaway RSA private key file, once per test session."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    key_file = tmp_path_factory.mktemp("keys") / "test_private.key"
+    key_file.write_bytes(key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        encryption_algorithm=serialization.NoEncryption()
+    ))
+    return str(key_file)
+
+
+@pytest.fixture(scope="session")
+def jwt_auth(mock_private_key):
+    """Shared auth instance for tests that only read from it."""
+    return SalesforceJWTAuth(
+        instance_url="https://test.salesforce.com",
+        client_id="test_client_id",
+        username="test@example.com",
+        private_key_path=mock_private_key
+    )
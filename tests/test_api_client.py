@@ -0,0 +1,106 @@
+"""
+Tests for Salesforce API client helpers.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+import requests
+from src.salesforce.api_client import RecordUpdateBatcher
+
+
+class TestRecordUpdateBatcher:
+    """Test suite for RecordUpdateBatcher."""
+
+    @staticmethod
+    def _start_updates(batcher, record_ids):
+        """Call update() for each ID on its own thread; return threads and outcomes."""
+        outcomes = {}
+
+        def run(record_id):
+            try:
+                outcomes[record_id] = batcher.update(record_id, {"OwnerId": "005A"})
+            except Exception as e:
+                outcomes[record_id] = e
+
+        threads = [threading.Thread(target=run, args=(record_id,)) for record_id in record_ids]
+        for thread in threads:
+            thread.start()
+        return threads, outcomes
+
+    @staticmethod
+    def _wait_for(condition, timeout=2.0):
+        """Poll until condition() holds or the timeout passes."""
+        deadline = time.monotonic() + timeout
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return condition()
+
+    def test_lone_update_flushes_without_waiting(self):
+        """Test a single update is sent at once, not after flush_interval."""
+        sf_client = MagicMock()
+        sf_client.update_records_bulk.return_value = [{"success": True}]
+        batcher = RecordUpdateBatcher(sf_client, "Lead", flush_interval=5.0)
+
+        start = time.monotonic()
+        assert batcher.update("00Q1", {"OwnerId": "005A"}) is True
+
+        assert time.monotonic() - start < 1.0
+        sf_client.update_records_bulk.assert_called_once_with("Lead", [{"Id": "00Q1", "OwnerId": "005A"}])
+
+    def test_full_batch_flushes_while_another_is_in_flight(self):
+        """Test a full batch is sent immediately rather than waiting on the in-flight one."""
+        release = threading.Event()
+        batches = []
+
+        def update_records_bulk(sobject_type, updates):
+            batches.append([update["Id"] for update in updates])
+            if len(batches) == 1:
+                release.wait(5)  # hold the first batch on the wire
+            return [{"success": True}] * len(updates)
+
+        sf_client = MagicMock()
+        sf_client.update_records_bulk.side_effect = update_records_bulk
+        batcher = RecordUpdateBatcher(sf_client, "Lead", flush_interval=5.0, max_batch=3)
+
+        first, _ = self._start_updates(batcher, ["00Q0"])
+        assert self._wait_for(lambda: len(batches) == 1)
+        queued, outcomes = self._start_updates(batcher, ["00Q1", "00Q2", "00Q3"])
+
+        assert self._wait_for(lambda: len(batches) == 2)
+        assert sorted(batches[1]) == ["00Q1", "00Q2", "00Q3"]
+
+        release.set()
+        for thread in first + queued:
+            thread.join(5)
+        assert outcomes == {"00Q1": True, "00Q2": True, "00Q3": True}
+
+    def test_failed_batch_raises_for_every_caller(self):
+        """Test a failed collection PATCH reaches every update waiting on it."""
+        release = threading.Event()
+        calls = []
+
+        def update_records_bulk(sobject_type, updates):
+            calls.append(len(updates))
+            if len(calls) == 1:
+                release.wait(5)
+                return [{"success": True}]
+            raise requests.exceptions.HTTPError("503 Service Unavailable")
+
+        sf_client = MagicMock()
+        sf_client.update_records_bulk.side_effect = update_records_bulk
+        batcher = RecordUpdateBatcher(sf_client, "Lead", flush_interval=5.0, max_batch=10)
+
+        first, _ = self._start_updates(batcher, ["00Q0"])
+        assert self._wait_for(lambda: len(calls) == 1)
+        queued, outcomes = self._start_updates(batcher, ["00Q1", "00Q2", "00Q3"])
+        assert self._wait_for(lambda: len(batcher._pending) == 3)
+
+        release.set()
+        for thread in first + queued:
+            thread.join(5)
+
+        assert calls == [1, 3]
+        assert len(outcomes) == 3
+        for outcome in outcomes.values():
+            assert isinstance(outcome, requests.exceptions.HTTPError)
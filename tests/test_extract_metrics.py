@@ -0,0 +1,42 @@
+"""
+Tests for metrics extraction.
+"""
+
+import json
+from unittest.mock import MagicMock
+from src.analytics.extract_metrics import MetricsExtractor
+
+
+def _template_log(lead_id, confidence):
+    """Build an outreach.template_suggest flywheel log entry."""
+    suggestion = {
+        "template_id": "T1",
+        "intent_detected": "demo",
+        "confidence": confidence,
+        "reason": "fit"
+    }
+    return {
+        "timestamp": "2026-01-01T00:00:00Z",
+        "metadata": {"lead_id": lead_id},
+        "response": {"choices": [{"message": {"content": json.dumps(suggestion)}}]}
+    }
+
+
+class TestMetricsExtractor:
+    """Test suite for MetricsExtractor."""
+
+    def test_template_metrics_skip_missing_confidence(self, tmp_path):
+        """Test suggestions without a confidence are left out of confidence stats."""
+        extractor = MetricsExtractor(MagicMock(), MagicMock(), output_dir=str(tmp_path))
+        logs = [_template_log("00Q1", 0.9), _template_log("00Q2", None), _template_log("00Q3", 0.3)]
+
+        metrics = extractor.extract_template_metrics(template_logs=logs)
+
+        assert metrics["total_suggestions"] == 3
+        assert metrics["by_template"] == {"T1": 3}
+        assert metrics["avg_confidence"] == 0.6
+        assert metrics["confidence_distribution"] == {
+            "high (>0.8)": 1,
+            "medium (0.5-0.8)": 0,
+            "low (<0.5)": 1
+        }
@@ -0,0 +1,53 @@
+"""
+Tests for flywheel log writing.
+"""
+
+import builtins
+import pytest
+from src.flywheel.logger import FlywheelLogger
+
+
+class TestFlywheelLogger:
+    """Test suite for FlywheelLogger."""
+
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_interleaved_workloads_keep_writers_open(self, tmp_path, monkeypatch, compress):
+        """Test alternating workloads open each day's log file only once."""
+        flywheel = FlywheelLogger(
+            "test-client", log_path=str(tmp_path), compress=compress, flush_every=10
+        )
+        opened = []
+        real_open = builtins.open
+
+        def tracking_open(file, *args, **kwargs):
+            opened.append(str(file))
+            return real_open(file, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "open", tracking_open)
+        for i in range(10):
+            flywheel.log_decision("lead.route", {"i": i}, {"ok": True})
+            flywheel.log_decision("outreach.template_suggest", {"i": i}, {"ok": True})
+        monkeypatch.undo()
+
+        assert len(opened) == 2
+        assert len(set(opened)) == 2
+        for workload_id in ("lead.route", "outreach.template_suggest"):
+            assert len(flywheel.get_logs(workload_id, days=1)) == 10
+        flywheel.close()
+
+    def test_interleaved_workloads_flush_in_groups(self, tmp_path):
+        """Test each file's lines are held until flush_every entries, across workloads."""
+        flywheel = FlywheelLogger("test-client", log_path=str(tmp_path), flush_every=10)
+        for i in range(9):
+            flywheel.log_decision("lead.route", {"i": i}, {"ok": True})
+            flywheel.log_decision("outreach.template_suggest", {"i": i}, {"ok": True})
+
+        assert all(f.stat().st_size == 0 for f in tmp_path.iterdir())
+
+        flywheel.log_decision("lead.route", {"i": 9}, {"ok": True})
+        route_log = next(tmp_path.glob("lead.route_*"))
+        suggest_log = next(tmp_path.glob("outreach.template_suggest_*"))
+
+        assert len(route_log.read_bytes().splitlines()) == 10
+        assert suggest_log.stat().st_size == 0
+        flywheel.close()
@@ -0,0 +1,53 @@
+"""
+Tests for CDC replay ID persistence.
+"""
+
+import json
+import time
+from app.cdc.replay_store import ReplayStore
+
+
+class TestReplayStore:
+    """Test suite for ReplayStore."""
+
+    def test_replay_batched_flush(self, tmp_path):
+        """Test replay IDs are buffered in memory and written once on flush."""
+        path = tmp_path / "replay.json"
+        store = ReplayStore(str(path), flush_interval=None)
+        mtime = path.stat().st_mtime_ns
+
+        for replay_id in range(1, 51):
+            store.set("/data/LeadChangeEvent", str(replay_id))
+
+        # Reads see the latest value while the file is untouched mid-batch
+        assert store.get("/data/LeadChangeEvent") == "50"
+        assert path.stat().st_mtime_ns == mtime
+        assert json.loads(path.read_text()) == {}
+
+        store.flush()
+
+        assert json.loads(path.read_text()) == {"/data/LeadChangeEvent": "50"}
+        assert ReplayStore(str(path)).get("/data/LeadChangeEvent") == "50"
+
+    def test_flush_interval_writes_through(self, tmp_path):
+        """Test set() persists on its own once the flush interval has passed."""
+        path = tmp_path / "replay.json"
+        store = ReplayStore(str(path), flush_interval=0)
+
+        store.set("/data/TaskChangeEvent", "7")
+
+        assert json.loads(path.read_text()) == {"/data/TaskChangeEvent": "7"}
+
+    def test_trailing_flush_without_further_sets(self, tmp_path):
+        """Test a lone set() reaches disk within about flush_interval."""
+        path = tmp_path / "replay.json"
+        store = ReplayStore(str(path), flush_interval=0.05)
+
+        store.set("/data/LeadChangeEvent", "42")
+        assert json.loads(path.read_text()) == {}
+
+        deadline = time.monotonic() + 2
+        while '"42"' not in path.read_text() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert json.loads(path.read_text()) == {"/data/LeadChangeEvent": "42"}
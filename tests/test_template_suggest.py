@@ -0,0 +1,43 @@
+"""
+Tests for template suggestion.
+"""
+
+from unittest.mock import MagicMock
+import pytest
+from src.workloads import template_suggest
+from src.workloads.template_suggest import TemplateSuggester
+
+
+@pytest.fixture
+def suggester(tmp_path, monkeypatch):
+    """Suggester with stubbed Salesforce and an LLM client that always fails."""
+    anthropic = MagicMock()
+    anthropic.messages.create.side_effect = RuntimeError("LLM unavailable")
+    monkeypatch.setattr(template_suggest, "get_anthropic", lambda: anthropic)
+    return TemplateSuggester(
+        MagicMock(),
+        MagicMock(),
+        templates_path=str(tmp_path / "missing.json")
+    )
+
+
+class TestTemplateSuggester:
+    """Test suite for TemplateSuggester."""
+
+    def test_null_description_uses_general_inquiry(self, suggester):
+        """Test a Lead with Description: null falls back instead of raising."""
+        suggester.sf_client.get_record.return_value = {
+            "Id": "00Q1",
+            "FirstName": "Ada",
+            "Company": "Acme",
+            "Email": "ada@example.com",
+            "NumberOfEmployees": 50,
+            "Description": None,
+            "Owner": {"Name": "Rep"}
+        }
+
+        result = suggester.suggest_template("00Q1")
+
+        assert result["template_id"] == "general_inquiry"
+        suggester.flywheel_logger.log_template_suggest.assert_called_once()
+        assert suggester.flywheel_logger.log_template_suggest.call_args.kwargs["inquiry_text"] == "General inquiry"